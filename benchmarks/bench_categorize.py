@@ -0,0 +1,107 @@
+"""
+Throughput benchmark: per-text any() scans vs categorize_text vs categorize_batch
+
+Dense text uses the keyword-heavy posts of bench_clean_texts; sparse text
+contains a keyword in only a small share of the posts.
+
+Usage:
+    python -m benchmarks.bench_categorize [n_texts] [n_jobs]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.bench_clean_texts import make_texts
+from src.categorizer import CATEGORY_KEYWORDS, DEFAULT_CATEGORY, categorize_batch, categorize_text
+
+
+def categorize_any(text):
+    """
+    Reference categorizer: one any() scan per category, as before KeywordCategorizer
+
+    Args:
+        text: Input text string
+
+    Returns:
+        str: Category label
+    """
+    text_lower = text.lower()
+    for label, keywords in CATEGORY_KEYWORDS:
+        if any(word in text_lower for word in keywords):
+            return label
+    return DEFAULT_CATEGORY
+
+
+def make_sparse_texts(n_texts, keyword_rate=0.01, seed=42):
+    """
+    Generate posts where only a fraction contain any category keyword
+
+    Args:
+        n_texts: Number of texts to generate
+        keyword_rate: Share of texts with one inserted keyword (default: 0.01)
+        seed: Random seed (default: 42)
+
+    Returns:
+        list: Raw text strings
+    """
+    rng = random.Random(seed)
+    words = ['The', 'quoted', 'text', 'is', 'not', 'convincing', 'and', 'about', 'Jim',
+             'writes:', '1993', 'it', 'for', 'disagree', 'Re:', '>>', '--', '(42)']
+    keywords = [keyword for _, category_keywords in CATEGORY_KEYWORDS for keyword in category_keywords]
+    texts = []
+    for _ in range(n_texts):
+        tokens = [rng.choice(words) for _ in range(rng.randint(8, 40))]
+        if rng.random() < keyword_rate:
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(keywords))
+        texts.append(' '.join(tokens))
+    return texts
+
+
+def time_corpus(name, texts, n_jobs):
+    """
+    Time the three categorizers on one corpus and verify identical labels
+
+    Args:
+        name: Corpus name for the report
+        texts: Raw text strings
+        n_jobs: Worker processes for categorize_batch
+    """
+    start = time.perf_counter()
+    expected = [categorize_any(text) for text in texts]
+    runtime_any = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [categorize_text(text) for text in texts]
+    runtime_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = categorize_batch(texts, n_jobs=n_jobs)
+    runtime_batch = time.perf_counter() - start
+
+    assert single == expected, "categorize_text labels differ from the any() scans"
+    assert batch == expected, "categorize_batch labels differ from the any() scans"
+
+    n_texts = len(texts)
+    print(f"{name}: {n_texts} texts")
+    print(f"  any() per text:            {runtime_any:.3f}s  {n_texts / runtime_any:,.0f} texts/s")
+    print(f"  categorize_text:           {runtime_single:.3f}s  {n_texts / runtime_single:,.0f} texts/s  "
+          f"({runtime_any / runtime_single:.2f}x)")
+    print(f"  categorize_batch (n_jobs={n_jobs}): {runtime_batch:.3f}s  {n_texts / runtime_batch:,.0f} texts/s  "
+          f"({runtime_any / runtime_batch:.2f}x)")
+
+
+def main():
+    """
+    Time all categorizers on dense and sparse text
+    """
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    time_corpus("Dense (keyword in nearly every text)", make_texts(n_texts), n_jobs)
+    time_corpus("Sparse (keyword in 1% of texts)", make_sparse_texts(n_texts), n_jobs)
+    print("Labels identical across all methods")
+
+
+if __name__ == "__main__":
+    main()
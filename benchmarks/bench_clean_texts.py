@@ -0,0 +1,69 @@
+"""
+Throughput benchmark: clean_text (per document) vs clean_texts (batched)
+
+Usage:
+    python -m benchmarks.bench_clean_texts [n_texts] [n_jobs]
+"""
+
+import random
+import sys
+import time
+
+from src.preprocessing import clean_text, clean_texts
+
+
+def make_texts(n_texts, seed=42):
+    """
+    Generate synthetic newsgroup-style posts with URLs, mentions and noise
+
+    Args:
+        n_texts: Number of texts to generate
+        seed: Random seed (default: 42)
+
+    Returns:
+        list: Raw text strings
+    """
+    rng = random.Random(seed)
+    words = ['The', 'evidence', 'for', 'God', 'is', 'not', 'convincing', 'Religion',
+             'and', 'science', 'disagree', 'about', 'morality', "isn't", 'it?', '1993',
+             'Re:', '>>', 'quoted', 'text', '--', 'Jim', 'writes:', '(42)']
+    extras = ['http://www.example.com/faq', 'www.atheism.org/page?id=7', '@jsmith',
+              '#atheism', 'user@host.edu', 'https://ftp.uu.net/pub']
+    texts = []
+    for _ in range(n_texts):
+        tokens = [rng.choice(words) for _ in range(rng.randint(8, 40))]
+        for _ in range(rng.randint(0, 2)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(extras))
+        texts.append(' '.join(tokens))
+    return texts
+
+
+def main():
+    """
+    Time both implementations and verify identical output
+    """
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    texts = make_texts(n_texts)
+    n_bytes = sum(len(text) for text in texts)
+
+    start = time.perf_counter()
+    expected = [clean_text(text) for text in texts]
+    runtime_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = clean_texts(texts, n_jobs=n_jobs)
+    runtime_batch = time.perf_counter() - start
+
+    assert result == expected, "clean_texts output differs from clean_text"
+
+    print(f"Texts: {n_texts}  ({n_bytes / 1e6:.1f} MB)")
+    print(f"  clean_text  (per document): {runtime_single:.3f}s  "
+          f"{n_texts / runtime_single:,.0f} texts/s")
+    print(f"  clean_texts (n_jobs={n_jobs}):     {runtime_batch:.3f}s  "
+          f"{n_texts / runtime_batch:,.0f} texts/s")
+    print(f"  Speedup: {runtime_single / runtime_batch:.2f}x (outputs identical)")
+
+
+if __name__ == "__main__":
+    main()
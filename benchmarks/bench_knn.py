@@ -0,0 +1,62 @@
+"""
+Neighbor search benchmark: exact brute force vs the approximate RP-forest index
+
+Usage:
+    python -m benchmarks.bench_knn [n_samples ...] [--k K] [--recall R]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.knn import build_knn_graph, compute_neighbors
+
+
+def make_points(n_samples, n_features=50, n_clusters=20, seed=42):
+    """
+    Generate clustered float32 points resembling PCA-reduced embeddings
+
+    Args:
+        n_samples: Number of points
+        n_features: Dimensions (default: 50, the t-SNE pre-reduction size)
+        n_clusters: Gaussian clusters (default: 20)
+        seed: Random seed (default: 42)
+
+    Returns:
+        numpy.ndarray: Points of shape (n_samples, n_features)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, n_features)) * 4
+    labels = rng.integers(n_clusters, size=n_samples)
+    return (centers[labels] + rng.standard_normal((n_samples, n_features))).astype(np.float32)
+
+
+def main():
+    """
+    Time both searches at each size and report the recall of the index
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('sizes', nargs='*', type=int, default=[10_000, 50_000, 100_000])
+    parser.add_argument('--k', type=int, default=91, help='neighbors per point (default: 91, perplexity 30)')
+    parser.add_argument('--recall', type=float, default=0.9, help='recall target of the index (default: 0.9)')
+    args = parser.parse_args()
+
+    print(f"{'n_samples':>10} {'exact':>10} {'approx':>10} {'recall':>8} {'speedup':>8}")
+    for n_samples in args.sizes:
+        X = make_points(n_samples)
+
+        start = time.perf_counter()
+        compute_neighbors(X, args.k, n_jobs=-1)
+        runtime_exact = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, recall = build_knn_graph(X, args.k, recall_target=args.recall, verbose=False)
+        runtime_approx = time.perf_counter() - start
+
+        print(f"{n_samples:>10} {runtime_exact:>9.2f}s {runtime_approx:>9.2f}s {recall:>8.3f} "
+              f"{runtime_exact / runtime_approx:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
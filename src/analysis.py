@@ -62,3 +62,32 @@ def analyze_pca_components(pca, w2v_model, top_n=10):
     print("  2. Look for patterns in their content")
     print("  3. Label the axis based on observed differences")
     print()
+
+
+def analyze_corpus(corpus, top_n=10):
+    """
+    Summarize the tokenized corpus used to train the embeddings
+
+    Args:
+        corpus: TokenCorpus of tokenized texts
+        top_n: Number of most frequent words to show (default: 10)
+    """
+    print(f"\n{'='*60}")
+    print("CORPUS STATISTICS")
+    print(f"{'='*60}")
+
+    doc_lengths = corpus.doc_lengths
+    frequencies = corpus.term_frequencies()
+
+    print(f"  Documents:       {len(corpus)}")
+    print(f"  Tokens:          {corpus.n_tokens}")
+    print(f"  Vocabulary size: {len(corpus.words)}")
+    if len(corpus) > 0:
+        print(f"  Tokens per document: mean {doc_lengths.mean():.1f}, "
+              f"median {np.median(doc_lengths):.0f}, max {doc_lengths.max()}")
+    print(f"  Token buffer size: {corpus.nbytes / 1024**2:.2f} MB")
+
+    if len(frequencies) > 0:
+        print(f"\n  Top {top_n} most frequent words:")
+        for token_id in np.argsort(frequencies)[::-1][:top_n]:
+            print(f"    {corpus.words[token_id]:<15} {frequencies[token_id]:>8}")
@@ -0,0 +1,181 @@
+"""
+Content-addressed on-disk cache for intermediate pipeline artifacts
+"""
+
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+
+# Default size limit for a cache directory (2 GB)
+DEFAULT_MAX_CACHE_BYTES = 2 * 1024**3
+
+
+def hash_texts(texts, *parts):
+    """
+    Compute a content hash of a list of texts plus extra key parts
+
+    Each text is length-prefixed so that different splits of the same
+    characters never collide; non-string items are hashed by type and repr.
+
+    Args:
+        texts: Iterable of input texts
+        *parts: Extra values mixed into the key (e.g. a version string)
+
+    Returns:
+        str: Hex digest identifying the inputs
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+
+    for text in texts:
+        if isinstance(text, str):
+            data = text.encode('utf-8', errors='surrogatepass')
+            digest.update(b's')
+        else:
+            data = f"{type(text).__name__}:{text!r}".encode('utf-8')
+            digest.update(b'o')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+
+    return digest.hexdigest()
+
+
+def _directory_size(path):
+    """
+    Total size in bytes of all files below a directory
+
+    Args:
+        path: Directory path
+
+    Returns:
+        int: Size in bytes
+    """
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+class ArtifactCache:
+    """
+    Directory of cache entries addressed by content keys
+
+    Each entry is a subdirectory named after its key. Entries are written
+    to a temporary directory and renamed into place, so readers never see
+    a partial entry. The least recently used entries (by directory mtime,
+    refreshed on every hit) are evicted once the cache grows past
+    max_bytes.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_CACHE_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (created if missing)
+            max_bytes: Size limit for all entries together (default: 2 GB)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        """Directory of the entry for key"""
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used
+
+        Args:
+            key: Entry key
+
+        Returns:
+            str or None: Entry directory, or None on a miss
+        """
+        entry = self.path(key)
+        if not os.path.isdir(entry):
+            return None
+
+        now = time.time()
+        os.utime(entry, (now, now))
+        return entry
+
+    def put(self, key, write_fn):
+        """
+        Create an entry atomically, then enforce the size limit
+
+        Args:
+            key: Entry key
+            write_fn: Callable receiving a directory path to write the entry into
+
+        Returns:
+            str: Entry directory
+        """
+        entry = self.path(key)
+        tmp_dir = os.path.join(self.root, f".tmp-{key}-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+
+        try:
+            write_fn(tmp_dir)
+            os.rename(tmp_dir, entry)
+        except OSError:
+            # Another process stored the same key first; keep its entry
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.evict(keep=key)
+        return entry
+
+    def entries(self):
+        """
+        List cache entries, least recently used first
+
+        Returns:
+            list: (key, mtime, size_bytes) tuples
+        """
+        entries = []
+        for key in os.listdir(self.root):
+            entry = self.path(key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            entries.append((key, os.path.getmtime(entry), _directory_size(entry)))
+        return sorted(entries, key=lambda item: item[1])
+
+    def evict(self, keep=None):
+        """
+        Remove least recently used entries until the cache fits max_bytes
+
+        Args:
+            keep: Key that must not be evicted (e.g. the entry just written)
+
+        Returns:
+            list: Keys that were removed
+        """
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        removed = []
+
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            total -= size
+            removed.append(key)
+
+        return removed
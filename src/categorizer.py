@@ -0,0 +1,189 @@
+"""
+Keyword-based topic categorization for text data
+"""
+
+import operator
+from itertools import repeat
+
+import numpy as np
+
+from .parallel import iter_chunks, parallel_map
+
+
+# Topic categories based on common themes in alt.atheism, in priority order:
+# a text gets the first category with any keyword present as a substring
+CATEGORY_KEYWORDS = [
+    ('Bible Discussion', ['bible', 'scripture', 'gospel', 'testament', 'biblical']),
+    ('Religion & Faith', ['religion', 'church', 'faith', 'belief', 'god', 'christian', 'islam', 'muslim']),
+    ('Atheism & Humanism', ['atheist', 'atheism', 'secular', 'humanist', 'freethinker', 'rationalist']),
+    ('Ethics & Philosophy', ['moral', 'ethics', 'ethical', 'morality', 'philosophy']),
+    ('Science & Evidence', ['science', 'evolution', 'evidence', 'research', 'study']),
+    ('Politics & Society', ['political', 'government', 'state', 'law', 'rights', 'separation']),
+]
+
+DEFAULT_CATEGORY = 'General Discussion'
+
+# Joins texts in a batch; no keyword contains it, so no match can span two texts
+_SEPARATOR = '\x00'
+
+# A keyword with more hits than 1/_DENSE_HIT_DIVISOR of the pending texts
+# (at least _MIN_DENSE_HITS) is dense: the rest of the chunk is then checked
+# text by text, which stops at each text's first occurrence
+_DENSE_HIT_DIVISOR = 32
+_MIN_DENSE_HITS = 64
+
+
+class KeywordCategorizer:
+    """
+    Precompiled multi-keyword categorizer
+
+    Single texts check each category's keywords in order with `in` and stop
+    at the first hit. Batches resolve categories from the highest priority
+    down, and only texts that are still unlabelled are searched for the next
+    keyword: the pending texts are lowercased and joined into one buffer,
+    and each keyword is located with a C-level substring sweep whose hit
+    offsets are mapped back to texts. A dense keyword (one that hits a large
+    share of the pending texts) switches to per-text `in` checks for the rest
+    of the chunk, and its texts leave the buffer. Labels are identical to the
+    single-text path.
+    """
+
+    def __init__(self, categories=CATEGORY_KEYWORDS, default=DEFAULT_CATEGORY):
+        """
+        Initialize the categorizer
+
+        Args:
+            categories: List of (label, keywords) pairs in priority order
+            default: Label for texts matching no category (default: 'General Discussion')
+        """
+        self.categories = [(label, [kw.lower() for kw in keywords]) for label, keywords in categories]
+        self.default = default
+        self._keywords = tuple((label, tuple(keywords)) for label, keywords in self.categories)
+        self._labels = np.array([label for label, _ in self.categories] + [default], dtype=object)
+
+    def categorize(self, text):
+        """
+        Categorize a single text
+
+        Args:
+            text: Input text string
+
+        Returns:
+            str: Category label
+        """
+        text_lower = text.lower()
+        for label, keywords in self._keywords:
+            for keyword in keywords:
+                if keyword in text_lower:
+                    return label
+        return self.default
+
+    def _categorize_chunk(self, texts):
+        """
+        Categorize one chunk of texts, highest-priority category first
+
+        Args:
+            texts: Sequence of text strings
+
+        Returns:
+            list: Category label for each text
+        """
+        n_categories = len(self.categories)
+        priority = np.full(len(texts), n_categories, dtype=np.int16)
+
+        # Texts without a label yet, as positions in the chunk and lowercased
+        index = np.arange(len(texts))
+        pending = [text.lower() for text in texts]
+        buffer = None
+
+        for rank, (_, keywords) in enumerate(self.categories):
+            for keyword in keywords:
+                if not pending:
+                    break
+                if buffer is None:
+                    buffer = _SEPARATOR.join(pending)
+                    lengths = np.fromiter(map(len, pending), dtype=np.int64, count=len(pending)) + 1
+                    starts = np.cumsum(lengths) - lengths
+                    found = np.zeros(len(pending), dtype=bool)
+                    find = buffer.find
+
+                max_hits = max(len(pending) // _DENSE_HIT_DIVISOR, _MIN_DENSE_HITS)
+                hits = []
+                pos = find(keyword)
+                while pos != -1 and len(hits) < max_hits:
+                    hits.append(pos)
+                    pos = find(keyword, pos + 1)
+                if not hits:
+                    continue
+
+                # Texts found by an earlier keyword keep their better rank
+                docs = np.searchsorted(starts, np.array(hits, dtype=np.int64), side='right') - 1
+                docs = docs[~found[docs]]
+                found[docs] = True
+                priority[index[docs]] = rank
+                if pos == -1:
+                    continue
+
+                # Dense keyword: check the remaining texts one by one, then
+                # drop every labelled text from the buffer
+                first = np.searchsorted(starts, pos, side='right') - 1
+                rest = first + np.flatnonzero(~found[first:])
+                matched = np.fromiter(map(operator.contains, [pending[i] for i in rest], repeat(keyword)),
+                                      dtype=bool, count=len(rest))
+                found[rest[matched]] = True
+                priority[index[rest[matched]]] = rank
+                keep = np.flatnonzero(~found)
+                index = index[keep]
+                pending = [pending[i] for i in keep]
+                buffer = None
+
+        return self._labels[priority].tolist()
+
+    def categorize_batch(self, texts, n_jobs=1, chunk_size=100_000):
+        """
+        Categorize a list or array of texts
+
+        Args:
+            texts: Sequence of text strings
+            n_jobs: Worker processes; -1 uses all cores (default: 1)
+            chunk_size: Texts per chunk, bounding the joined buffer size (default: 100000)
+
+        Returns:
+            list: Category label for each text, in input order
+        """
+        if len(texts) == 0:
+            return []
+
+        results = parallel_map(self._categorize_chunk, iter_chunks(texts, chunk_size), n_jobs=n_jobs)
+        return [label for chunk_labels in results for label in chunk_labels]
+
+
+_default_categorizer = KeywordCategorizer()
+
+
+def categorize_text(text):
+    """
+    Categorize text based on keyword presence
+
+    Args:
+        text: Input text string
+
+    Returns:
+        str: Category label
+    """
+    return _default_categorizer.categorize(text)
+
+
+def categorize_batch(texts, n_jobs=1, chunk_size=100_000):
+    """
+    Categorize many texts with the default keyword categories
+
+    Args:
+        texts: Sequence of text strings
+        n_jobs: Worker processes; -1 uses all cores (default: 1)
+        chunk_size: Texts per chunk (default: 100000)
+
+    Returns:
+        list: Category label for each text, in input order
+    """
+    return _default_categorizer.categorize_batch(texts, n_jobs=n_jobs, chunk_size=chunk_size)
@@ -0,0 +1,278 @@
+"""
+Compact integer-ID token corpus for tokenized text data
+"""
+
+import hashlib
+import os
+from array import array
+
+import numpy as np
+
+from .cache import DEFAULT_MAX_CACHE_BYTES, ArtifactCache, hash_texts
+from .preprocessing import PREPROCESSING_VERSION, clean_texts, tokenize_text
+
+
+class TokenCorpus:
+    """
+    Tokenized documents stored as integer IDs in CSR layout
+
+    Instead of a list of lists of Python strings, the corpus keeps:
+    - words: vocabulary as an array of strings (index = token ID)
+    - vocab: dict mapping each word to its token ID
+    - token_ids: flat uint32 buffer with every token of every document
+    - offsets: int64 array of length n_documents + 1; document i is
+      token_ids[offsets[i]:offsets[i + 1]]
+
+    Iterating yields each document as a list of words, so the corpus can
+    be passed anywhere a list of tokenized texts was used before
+    (e.g. Word2Vec(sentences=corpus)).
+    """
+
+    def __init__(self, words, token_ids, offsets):
+        """
+        Initialize the corpus from its arrays
+
+        Args:
+            words: Sequence of vocabulary words, indexed by token ID
+            token_ids: Flat array of token IDs
+            offsets: Document boundaries into token_ids (length n_documents + 1)
+        """
+        self.words = np.asarray(words, dtype=object)
+        self.vocab = {word: i for i, word in enumerate(self.words)}
+        self.token_ids = np.asarray(token_ids, dtype=np.uint32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_tokenized(cls, documents, drop_empty=False):
+        """
+        Build a corpus from an iterable of token lists
+
+        Args:
+            documents: Iterable of lists of word tokens (consumed once)
+            drop_empty: Skip documents with no tokens (default: False)
+
+        Returns:
+            TokenCorpus: The encoded corpus
+        """
+        vocab = {}
+        token_ids = array('I')
+        offsets = array('q', [0])
+
+        for tokens in documents:
+            if drop_empty and len(tokens) == 0:
+                continue
+            token_ids.extend([vocab.setdefault(word, len(vocab)) for word in tokens])
+            offsets.append(len(token_ids))
+
+        return cls(list(vocab), np.frombuffer(token_ids, dtype=np.uint32), np.frombuffer(offsets, dtype=np.int64))
+
+    def __len__(self):
+        """Number of documents"""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """
+        Get one document as a list of words
+
+        Args:
+            index: Document index
+
+        Returns:
+            list: Word tokens of the document
+        """
+        return self.words[self.doc_ids(index)].tolist()
+
+    def __iter__(self):
+        """Iterate over documents as lists of words (restartable)"""
+        for i in range(len(self)):
+            yield self[i]
+
+    def doc_ids(self, index):
+        """
+        Get the token IDs of one document without copying
+
+        Args:
+            index: Document index
+
+        Returns:
+            numpy array: View into token_ids
+        """
+        if index < 0:
+            index += len(self)
+        return self.token_ids[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def n_tokens(self):
+        """Total number of tokens in the corpus"""
+        return int(self.offsets[-1])
+
+    @property
+    def doc_lengths(self):
+        """Number of tokens in each document"""
+        return np.diff(self.offsets)
+
+    def doc_index(self):
+        """
+        Document index of every token (aligned with token_ids)
+
+        Returns:
+            numpy array: int64 array of length n_tokens
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.doc_lengths)
+
+    def term_frequencies(self):
+        """
+        Count occurrences of every vocabulary word
+
+        Returns:
+            numpy array: Count per token ID
+        """
+        return np.bincount(self.token_ids, minlength=len(self.words))
+
+    @property
+    def nbytes(self):
+        """Memory held by the token and offset buffers"""
+        return self.token_ids.nbytes + self.offsets.nbytes
+
+    def subset(self, indices):
+        """
+        Build a corpus of selected documents sharing this vocabulary
+
+        Args:
+            indices: Sorted or unsorted document indices to keep
+
+        Returns:
+            TokenCorpus: Corpus whose document i is self[indices[i]]
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        # Position of every kept token inside self.token_ids
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return TokenCorpus(self.words, self.token_ids[positions], offsets)
+
+    def concat(self, other):
+        """
+        Append another corpus, merging its vocabulary into this one
+
+        Words already known keep their IDs; new words are appended to the
+        vocabulary, and the other corpus' token IDs are remapped accordingly.
+
+        Args:
+            other: TokenCorpus to append
+
+        Returns:
+            TokenCorpus: Documents of self followed by documents of other
+        """
+        vocab = dict(self.vocab)
+        remap = np.fromiter(
+            (vocab.setdefault(word, len(vocab)) for word in other.words),
+            dtype=np.uint32, count=len(other.words)
+        )
+
+        token_ids = np.concatenate((self.token_ids, remap[other.token_ids]))
+        offsets = np.concatenate((self.offsets, self.offsets[-1] + other.offsets[1:]))
+        return TokenCorpus(list(vocab), token_ids, offsets)
+
+    def fingerprint(self):
+        """
+        Content hash of the vocabulary, token buffer and document offsets
+
+        Returns:
+            str: Hex digest that changes whenever the corpus content changes
+        """
+        digest = hashlib.sha256()
+        digest.update('\n'.join(self.words.tolist()).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(memoryview(np.ascontiguousarray(self.token_ids)))
+        digest.update(memoryview(np.ascontiguousarray(self.offsets)))
+        return digest.hexdigest()
+
+    def write_lines(self, path):
+        """
+        Write the corpus as a line-delimited text file (one document per line)
+
+        This is the format expected by gensim's corpus_file training mode.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for tokens in self:
+                f.write(' '.join(tokens))
+                f.write('\n')
+
+    def save(self, directory):
+        """
+        Write the corpus as .npy buffers plus a newline-separated vocabulary
+
+        Tokens never contain whitespace (they come from str.split), so one
+        word per line is unambiguous.
+
+        Args:
+            directory: Existing directory to write into
+        """
+        np.save(os.path.join(directory, 'token_ids.npy'), self.token_ids)
+        np.save(os.path.join(directory, 'offsets.npy'), self.offsets)
+        with open(os.path.join(directory, 'vocab.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.words.tolist()))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load a corpus written by save()
+
+        Args:
+            directory: Directory containing the corpus files
+            mmap: Memory-map the token buffers instead of reading them (default: True)
+
+        Returns:
+            TokenCorpus: The loaded corpus
+        """
+        mmap_mode = 'r' if mmap else None
+        token_ids = np.load(os.path.join(directory, 'token_ids.npy'), mmap_mode=mmap_mode)
+        offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode=mmap_mode)
+        with open(os.path.join(directory, 'vocab.txt'), 'r', encoding='utf-8') as f:
+            content = f.read()
+        words = content.split('\n') if content else []
+        return cls(words, token_ids, offsets)
+
+
+def build_corpus(texts, cache_dir=None, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
+    """
+    Clean and tokenize texts into a TokenCorpus, reusing a disk cache
+
+    The cache key is a hash of the input texts and PREPROCESSING_VERSION,
+    so any change to the data or to the cleaning rules yields a new entry.
+    On a hit the corpus buffers are memory-mapped instead of recomputed.
+    Empty documents are dropped.
+
+    Args:
+        texts: List of raw text strings
+        cache_dir: Cache directory; None disables caching (default: None)
+        max_cache_bytes: Size limit of the cache directory (default: 2 GB)
+
+    Returns:
+        TokenCorpus: The cleaned, tokenized corpus
+    """
+    cache = None
+    if cache_dir is not None:
+        cache = ArtifactCache(cache_dir, max_cache_bytes)
+        key = 'corpus-' + hash_texts(texts, PREPROCESSING_VERSION)
+        entry = cache.get(key)
+        if entry is not None:
+            print(f"  Loaded cached corpus: {entry}")
+            return TokenCorpus.load(entry)
+
+    cleaned_texts = clean_texts(texts)
+    corpus = TokenCorpus.from_tokenized(
+        (tokenize_text(text) for text in cleaned_texts), drop_empty=True
+    )
+
+    if cache is not None:
+        entry = cache.put(key, corpus.save)
+        print(f"  Cached corpus: {entry}")
+
+    return corpus
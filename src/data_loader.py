@@ -2,48 +2,356 @@
 Dataset loading utilities for text analysis
 """
 
-import pandas as pd
+import glob
 import os
+import random
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .categorizer import categorize_batch, categorize_text
+from .parallel import parallel_map
+
+
+def iter_text_lines(path, min_length=20):
+    """
+    Stream stripped text lines from a file one at a time
+
+    Args:
+        path: Path to a plain text file
+        min_length: Lines of this length or shorter are skipped (default: 20)
+
+    Yields:
+        str: Each stripped line longer than min_length
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if len(line) > min_length:
+                yield line
+
+
+def reservoir_sample(items, k, seed=42):
+    """
+    Draw a uniform random sample of k items in a single pass
+
+    Uses reservoir sampling (Algorithm R), so only k items are held in
+    memory no matter how long the input is.
+
+    Args:
+        items: Any iterable (consumed once)
+        k: Maximum sample size; None keeps every item
+        seed: Random seed for reproducible sampling (default: 42)
+
+    Returns:
+        tuple: (sample, n_seen) - Sampled items and total number of items read
+    """
+    if k is None:
+        sample = list(items)
+        return sample, len(sample)
+
+    rng = random.Random(seed)
+    sample = []
+    n_seen = 0
+    for item in items:
+        if n_seen < k:
+            sample.append(item)
+        else:
+            j = rng.randrange(n_seen + 1)
+            if j < k:
+                sample[j] = item
+        n_seen += 1
+
+    return sample, n_seen
+
+
+def _print_topic_distribution(labels):
+    """
+    Print the category counts of a labelled sample
+
+    Args:
+        labels: List of category labels
+    """
+    label_counts = Counter(labels)
+    n_samples = len(labels)
+    print(f"\n   Topic Distribution:")
+    for category, count in sorted(label_counts.items(), key=lambda x: x[1], reverse=True):
+        print(f"     - {category}: {count} ({100*count/n_samples:.1f}%)")
+
+
+# Candidate names for the text column of tabular datasets, in priority order
+TEXT_COLUMNS = ['text', 'content', 'message', 'document', 'data']
+
+# Arrow dataset formats by file extension
+_ARROW_FORMATS = {
+    '.parquet': 'parquet',
+    '.feather': 'ipc',
+    '.arrow': 'ipc',
+}
+
+# File extensions load_dataset() reads as tables rather than text lines
+TABLE_EXTENSIONS = ('.csv', *_ARROW_FORMATS)
+
+
+def _find_text_column(columns):
+    """
+    Pick the text column from a list of column names
+
+    Args:
+        columns: Column names of the dataset
+
+    Returns:
+        str: Name of the first column found in TEXT_COLUMNS
+
+    Raises:
+        ValueError: If none of TEXT_COLUMNS is present
+    """
+    for col in TEXT_COLUMNS:
+        if col in columns:
+            return col
+
+    print(f"\n   Available columns: {list(columns)}")
+    raise ValueError("Could not find text column")
+
+
+def _iter_csv_chunks(path, encoding, chunksize):
+    """
+    Stream the text column of a CSV file in chunks
+
+    Args:
+        path: Path to the CSV file
+        encoding: File encoding
+        chunksize: Rows per chunk
+
+    Returns:
+        tuple: (columns, text_col, chunks) - All column names, the text column
+            and an iterator of value lists
+    """
+    columns = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+    text_col = _find_text_column(columns)
+
+    reader = pd.read_csv(path, encoding=encoding, usecols=[text_col], chunksize=chunksize)
+    return columns, text_col, (chunk[text_col].tolist() for chunk in reader)
+
+
+def _iter_arrow_chunks(path, file_format, chunksize):
+    """
+    Stream the text column of a Parquet/Arrow file in record batches
+
+    Args:
+        path: Path to the Parquet or Arrow IPC (Feather) file
+        file_format: pyarrow dataset format ('parquet' or 'ipc')
+        chunksize: Rows per record batch
+
+    Returns:
+        tuple: (columns, text_col, chunks) - All column names, the text column
+            and an iterator of value lists
+    """
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Reading Parquet/Arrow files requires pyarrow (pip install pyarrow)")
+
+    dataset = ds.dataset(path, format=file_format)
+    columns = dataset.schema.names
+    text_col = _find_text_column(columns)
+
+    # Column pruning: only the text column is decoded from disk
+    batches = dataset.to_batches(columns=[text_col], batch_size=chunksize)
+    return columns, text_col, (batch.column(0).to_pylist() for batch in batches)
+
+
+def _sample_chunks(chunks, max_samples, seed):
+    """
+    Reservoir-sample values from an iterator of chunks
+
+    Args:
+        chunks: Iterator of value lists
+        max_samples: Number of values to keep; None keeps all
+        seed: Random seed for sampling
+
+    Returns:
+        tuple: (sample, n_seen) - Sampled values and number of values read
+    """
+    values = (value for chunk in chunks for value in chunk)
+    return reservoir_sample(values, max_samples, seed=seed)
+
+
+def _load_table_dataset(path, max_samples, seed):
+    """
+    Sample and categorize the text column of a tabular file
 
+    Args:
+        path: Path to a .csv, .parquet, .feather or .arrow file
+        max_samples: Number of texts to sample; None keeps all rows
+        seed: Random seed for sampling
 
-def categorize_text(text):
+    Returns:
+        tuple: (texts, labels) - Sampled texts and their category labels
     """
-    Categorize text based on keyword presence
+    # Only the text column is read, sampled while streaming through chunks
+    texts, n_rows = load_table_texts(path, max_samples=max_samples, seed=seed)
+
+    print(f"   Rows scanned: {n_rows}")
+
+    # Categorize all sampled texts in one batch
+    labels = categorize_batch([str(text) for text in texts])
+
+    print(f"   Sampled {len(texts)} texts for analysis")
+
+    return texts, labels
+
+
+def load_table_texts(path, max_samples=5000, seed=42, chunksize=100_000):
+    """
+    Sample the text column of a CSV, Parquet or Arrow file in bounded memory
+
+    Only the detected text column is read, chunk by chunk, and rows are
+    reservoir-sampled as they stream past, so memory depends on the
+    chunk size and max_samples rather than on the file size.
 
     Args:
-        text: Input text string
+        path: Path to a .csv, .parquet, .feather or .arrow file
+        max_samples: Number of texts to sample; None keeps all rows (default: 5000)
+        seed: Random seed for sampling (default: 42)
+        chunksize: Rows read per chunk (default: 100000)
 
     Returns:
-        str: Category label
-    """
-    text_lower = text.lower()
-
-    # Define topic categories based on common themes in alt.atheism
-    if any(word in text_lower for word in ['bible', 'scripture', 'gospel', 'testament', 'biblical']):
-        return 'Bible Discussion'
-    elif any(word in text_lower for word in ['religion', 'church', 'faith', 'belief', 'god', 'christian', 'islam', 'muslim']):
-        return 'Religion & Faith'
-    elif any(word in text_lower for word in ['atheist', 'atheism', 'secular', 'humanist', 'freethinker', 'rationalist']):
-        return 'Atheism & Humanism'
-    elif any(word in text_lower for word in ['moral', 'ethics', 'ethical', 'morality', 'philosophy']):
-        return 'Ethics & Philosophy'
-    elif any(word in text_lower for word in ['science', 'evolution', 'evidence', 'research', 'study']):
-        return 'Science & Evidence'
-    elif any(word in text_lower for word in ['political', 'government', 'state', 'law', 'rights', 'separation']):
-        return 'Politics & Society'
+        tuple: (texts, n_rows) - Sampled texts and total number of rows scanned
+    """
+    ext = os.path.splitext(path)[1].lower()
+    encoding_note = ''
+
+    if ext in _ARROW_FORMATS:
+        columns, text_col, chunks = _iter_arrow_chunks(path, _ARROW_FORMATS[ext], chunksize)
+        texts, n_rows = _sample_chunks(chunks, max_samples, seed)
     else:
-        return 'General Discussion'
+        try:
+            columns, text_col, chunks = _iter_csv_chunks(path, 'utf-8', chunksize)
+            texts, n_rows = _sample_chunks(chunks, max_samples, seed)
+        except UnicodeDecodeError:
+            # Restart the stream; latin-1 decodes any byte sequence
+            columns, text_col, chunks = _iter_csv_chunks(path, 'latin-1', chunksize)
+            texts, n_rows = _sample_chunks(chunks, max_samples, seed)
+            encoding_note = ' (latin-1 encoding)'
+
+    print(f"   Loaded: {path}{encoding_note}")
+    print(f"   Columns: {columns}")
+    print(f"   Using text column: '{text_col}'")
+
+    return texts, n_rows
+
+
+def resolve_shard_paths(source, pattern='*.txt'):
+    """
+    Expand a directory or glob into a sorted list of shard files
+
+    Args:
+        source: Directory (matched against pattern) or glob such as 'data/*.txt'
+        pattern: File pattern used when source is a directory (default: '*.txt')
+
+    Returns:
+        list: Sorted file paths, so shard order never depends on the filesystem
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, pattern)
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+
+def _load_shard(task):
+    """
+    Read, filter, sample and categorize one shard (runs in a worker process)
+
+    Args:
+        task: (path, max_samples, seed) tuple
+
+    Returns:
+        tuple: (texts, labels, n_valid) - Local sample, its labels and the
+            number of valid lines in the shard
+    """
+    path, max_samples, seed = task
+    texts, n_valid = reservoir_sample(iter_text_lines(path), max_samples, seed=seed)
+    return texts, categorize_batch(texts), n_valid
+
 
+def load_corpus_shards(source, max_samples=5000, seed=42, n_jobs=-1):
+    """
+    Load and sample a corpus split across many text files in parallel
+
+    Every shard is reservoir-sampled independently in a worker process.
+    The global sample is then drawn by splitting max_samples across
+    shards with a multivariate hypergeometric draw over the shard sizes
+    and taking that many items from each local reservoir, which gives a
+    uniform sample of the combined corpus. Output depends only on the
+    seed and the set of shard files, not on worker scheduling.
 
-def load_dataset():
+    Args:
+        source: Directory of .txt shards or a glob such as 'data/*.txt'
+        max_samples: Number of texts to sample; None keeps every line (default: 5000)
+        seed: Random seed for sampling (default: 42)
+        n_jobs: Worker processes; -1 uses all cores (default: -1)
+
+    Returns:
+        tuple: (texts, labels, n_valid) - Sampled texts, their category labels
+            and the total number of valid lines across shards
+
+    Raises:
+        FileNotFoundError: If source matches no files
+    """
+    paths = resolve_shard_paths(source)
+    if not paths:
+        raise FileNotFoundError(f"No shard files found for '{source}'")
+
+    # Independent, reproducible seed per shard
+    shard_seeds = np.random.SeedSequence(seed).generate_state(len(paths))
+    tasks = [(path, max_samples, int(shard_seed)) for path, shard_seed in zip(paths, shard_seeds)]
+    results = parallel_map(_load_shard, tasks, n_jobs=n_jobs)
+
+    counts = np.array([n_valid for _, _, n_valid in results], dtype=np.int64)
+    n_valid = int(counts.sum())
+
+    if max_samples is None or n_valid <= max_samples:
+        texts = [text for shard_texts, _, _ in results for text in shard_texts]
+        labels = [label for _, shard_labels, _ in results for label in shard_labels]
+        return texts, labels, n_valid
+
+    # Number of global samples falling in each shard
+    rng = np.random.default_rng(seed)
+    takes = rng.multivariate_hypergeometric(counts, max_samples)
+
+    texts, labels = [], []
+    for (shard_texts, shard_labels, _), take in zip(results, takes):
+        for i in rng.choice(len(shard_texts), size=take, replace=False):
+            texts.append(shard_texts[i])
+            labels.append(shard_labels[i])
+
+    return texts, labels, n_valid
+
+
+def load_dataset(data_path='data/alt.atheism.txt', max_samples=5000, seed=42, n_jobs=-1):
     """
     Load text dataset from alt.atheism.txt or fallback options
 
     Attempts to load from:
-    1. data/alt.atheism.txt (primary text file)
-    2. CSV files (generic text data)
+    1. data_path (text file, tabular file, directory or glob)
+    2. CSV/Parquet/Arrow files with standard names in the working directory
     3. Demo data (fallback)
 
+    The text file is streamed line by line and sampled with reservoir
+    sampling, so memory stays proportional to max_samples rather than
+    to the size of the corpus. A .csv, .parquet, .feather or .arrow
+    data_path is read column-wise with load_table_texts. A directory or
+    glob (e.g. 'data/*.txt') is loaded as a sharded corpus with
+    load_corpus_shards.
+
+    Args:
+        data_path: Text file, tabular file, directory of .txt shards or glob
+            (default: 'data/alt.atheism.txt')
+        max_samples: Number of texts to sample; None streams the full corpus (default: 5000)
+        seed: Random seed for sampling (default: 42)
+        n_jobs: Worker processes for sharded corpora; -1 uses all cores (default: -1)
+
     Returns:
         tuple: (texts, labels) - List of text strings and their category labels
     """
@@ -53,102 +361,80 @@ def load_dataset():
 
     print("\n1. Loading dataset...")
 
-    # Try loading alt.atheism.txt first
-    atheism_file = 'data/alt.atheism.txt'
-    if os.path.exists(atheism_file):
-        print(f"   Found: {atheism_file}")
+    # Sharded corpus: a directory or glob of text files
+    if os.path.isdir(data_path) or glob.has_magic(data_path):
         try:
-            with open(atheism_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+            texts, labels, n_valid = load_corpus_shards(
+                data_path, max_samples=max_samples, seed=seed, n_jobs=n_jobs
+            )
 
-            # Filter out empty lines and very short lines
-            texts = [line.strip() for line in lines if len(line.strip()) > 20]
+            print(f"   Found: {len(resolve_shard_paths(data_path))} shard files in {data_path}")
+            print(f"   Valid text lines: {n_valid}")
+            print(f"   Sampled {len(texts)} text lines for analysis")
+            _print_topic_distribution(labels)
 
-            print(f"   Total lines: {len(lines)}")
-            print(f"   Valid text lines: {len(texts)}")
+            return texts, labels
 
-            # Sample for faster processing
-            import random
-            random.seed(42)
-            n_samples = min(5000, len(texts))
-            sampled_texts = random.sample(texts, n_samples)
+        except Exception as e:
+            print(f"   Error loading shards from {data_path}: {e}")
+            print("   Trying CSV/Parquet fallback...")
+
+    # Tabular export: only its text column is read
+    elif os.path.exists(data_path) and os.path.splitext(data_path)[1].lower() in TABLE_EXTENSIONS:
+        print(f"   Found: {data_path}")
+        try:
+            return _load_table_dataset(data_path, max_samples, seed)
 
-            # Categorize each text
-            labels = [categorize_text(text) for text in sampled_texts]
+        except Exception as e:
+            print(f"   Error loading {data_path}: {e}")
+            print("   Trying CSV/Parquet fallback...")
+
+    # Try loading alt.atheism.txt first
+    elif os.path.exists(data_path):
+        print(f"   Found: {data_path}")
+        try:
+            # Stream valid lines and sample them in a single pass
+            sampled_texts, n_valid = reservoir_sample(
+                iter_text_lines(data_path), max_samples, seed=seed
+            )
+            n_samples = len(sampled_texts)
 
-            # Count categories
-            from collections import Counter
-            label_counts = Counter(labels)
+            print(f"   Valid text lines: {n_valid}")
+
+            # Categorize all sampled texts in one batch
+            labels = categorize_batch(sampled_texts)
 
             print(f"   Sampled {n_samples} text lines for analysis")
             print(f"   Dataset: alt.atheism newsgroup posts")
-            print(f"\n   Topic Distribution:")
-            for category, count in sorted(label_counts.items(), key=lambda x: x[1], reverse=True):
-                print(f"     - {category}: {count} ({100*count/n_samples:.1f}%)")
+            _print_topic_distribution(labels)
 
             return sampled_texts, labels
 
         except Exception as e:
-            print(f"   Error loading {atheism_file}: {e}")
-            print("   Trying CSV fallback...")
+            print(f"   Error loading {data_path}: {e}")
+            print("   Trying CSV/Parquet fallback...")
 
-    # Fallback to CSV files
+    # Fallback to tabular files (CSV, Parquet, Arrow)
     try:
-        print("   Looking for CSV files...")
+        print("   Looking for CSV/Parquet files...")
         possible_files = [
             'data.csv',
             'texts.csv',
             'dataset.csv',
-            'newsgroup.csv'
+            'newsgroup.csv',
+            'data.parquet',
+            'texts.parquet',
+            'dataset.parquet',
+            'newsgroup.parquet',
+            'data.feather',
+            'data.arrow'
         ]
 
-        df = None
-        for filename in possible_files:
-            try:
-                df = pd.read_csv(filename, encoding='utf-8')
-                print(f"   Loaded: {filename}")
-                break
-            except FileNotFoundError:
-                continue
-            except UnicodeDecodeError:
-                try:
-                    df = pd.read_csv(filename, encoding='latin-1')
-                    print(f"   Loaded: {filename} (latin-1 encoding)")
-                    break
-                except:
-                    continue
-
-        if df is None:
+        filename = next((f for f in possible_files if os.path.exists(f)), None)
+        if filename is None:
             raise FileNotFoundError("No dataset files found")
 
-        print(f"   Dataset shape: {df.shape}")
-        print(f"   Columns: {list(df.columns)}")
-
-        # Find text column
-        text_columns = ['text', 'content', 'message', 'document', 'data']
-        text_col = None
-        for col in text_columns:
-            if col in df.columns:
-                text_col = col
-                break
-
-        if text_col is None:
-            print(f"\n   Available columns: {list(df.columns)}")
-            raise ValueError("Could not find text column")
-
-        print(f"   Using text column: '{text_col}'")
-
-        # Sample texts for faster processing
-        n_samples = min(5000, len(df))
-        sampled_df = df.sample(n=n_samples, random_state=42)
-        texts = sampled_df[text_col].values
-
-        # Categorize each text
-        labels = [categorize_text(str(text)) for text in texts]
-
-        print(f"   Sampled {n_samples} texts for analysis")
-
-        return texts, labels
+        return _load_table_dataset(filename, max_samples, seed)
 
     except Exception as e:
         print(f"\n   WARNING: Could not load any dataset files!")
@@ -174,6 +460,6 @@ def _get_demo_data():
         "Historical analysis reveals complex relationships between religion and politics",
     ] * 150  # Replicate for demonstration
 
-    labels = [categorize_text(text) for text in texts]
+    labels = categorize_batch(texts)
 
     return texts, labels
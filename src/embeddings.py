@@ -2,69 +2,493 @@
 Word2Vec embedding generation for text data
 """
 
+import hashlib
+import os
+import tempfile
+import time
+
 import numpy as np
-from gensim.models import Word2Vec
-from .preprocessing import clean_text, tokenize_text
+from gensim.models import KeyedVectors, Word2Vec
+from gensim.models.callbacks import CallbackAny2Vec
+from .cache import DEFAULT_MAX_CACHE_BYTES, ArtifactCache
+from .corpus import build_corpus
+
+
+# File name of the saved model inside a cache entry
+_MODEL_FILENAME = 'word2vec.model'
+
+# File name of the line-delimited corpus inside a cache entry
+_CORPUS_LINES_FILENAME = 'corpus.txt'
+
+# File name of converted pretrained vectors inside a cache entry
+_VECTORS_FILENAME = 'vectors.kv'
+
+# Extensions of files in the original word2vec C format (binary or text)
+_WORD2VEC_FORMAT_EXTENSIONS = ('.bin', '.bin.gz', '.txt', '.txt.gz', '.vec', '.vec.gz')
+
+
+def _iter_doc_blocks(offsets, block_tokens):
+    """
+    Split documents into consecutive ranges of about block_tokens tokens
+
+    Args:
+        offsets: Corpus document offsets (length n_documents + 1)
+        block_tokens: Target number of tokens per range
+
+    Yields:
+        tuple: (first_doc, end_doc) half-open document range
+    """
+    n_docs = len(offsets) - 1
+    start = 0
+    while start < n_docs:
+        end = int(np.searchsorted(offsets, offsets[start] + block_tokens, side='right')) - 1
+        end = min(max(end, start + 1), n_docs)
+        yield start, end
+        start = end
+
+
+def _in_vocab_counts(model_ids, block_offsets):
+    """
+    Count in-vocabulary tokens per document of one block
+
+    Args:
+        model_ids: Model row of every token in the block (-1 if out of vocabulary)
+        block_offsets: Offsets of the block's documents (length n_block_docs + 1)
+
+    Returns:
+        numpy array: Number of in-vocabulary tokens per document
+    """
+    cumulative = np.concatenate(([0], np.cumsum(model_ids >= 0)))
+    relative = block_offsets - block_offsets[0]
+    return cumulative[relative[1:]] - cumulative[relative[:-1]]
+
+
+def pool_document_vectors(corpus, wv, block_tokens=65_536, output_path=None):
+    """
+    Average the word vectors of every document in one vectorized pass
+
+    Corpus token IDs are mapped to model rows once through a vocabulary
+    lookup table. Documents are then processed in blocks: each block's
+    in-vocabulary rows are gathered from wv.vectors in one indexing
+    operation, and documents with the same number of known words are
+    averaged together as one (n_docs, length, dim) segment reduction.
+    This uses the same summation order as np.mean on each document's
+    vectors, so embeddings are bit-identical to per-word averaging.
+
+    Args:
+        corpus: TokenCorpus of tokenized texts
+        wv: KeyedVectors holding the word vectors
+        block_tokens: Tokens gathered per block, bounding temporary memory
+            (default: 65536)
+        output_path: .npy file to write embeddings into as a float32 memmap,
+            block by block; None keeps them in memory (default: None)
+
+    Returns:
+        tuple: (embeddings, valid_indices)
+            - embeddings: float32 array (or np.memmap) of shape (n_valid, vector_size)
+            - valid_indices: indices of documents with at least one known word
+    """
+    offsets = corpus.offsets
+
+    # Corpus token ID -> model row (-1 for words outside the model vocabulary)
+    lookup = np.fromiter(
+        (wv.key_to_index.get(word, -1) for word in corpus.words),
+        dtype=np.int32, count=len(corpus.words)
+    )
+
+    # First pass: in-vocabulary token counts decide which documents are valid
+    counts = np.zeros(len(corpus), dtype=np.int64)
+    for start, end in _iter_doc_blocks(offsets, block_tokens):
+        model_ids = lookup[corpus.token_ids[offsets[start]:offsets[end]]]
+        counts[start:end] = _in_vocab_counts(model_ids, offsets[start:end + 1])
+
+    valid_indices = np.flatnonzero(counts)
+    shape = (len(valid_indices), wv.vector_size)
+    if output_path is None:
+        embeddings = np.empty(shape, dtype=np.float32)
+    else:
+        embeddings = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float32, shape=shape)
+
+    # Second pass: gather rows and reduce them per document
+    row = 0
+    for start, end in _iter_doc_blocks(offsets, block_tokens):
+        block_counts = counts[start:end]
+        block_valid = np.flatnonzero(block_counts)
+        if len(block_valid) == 0:
+            continue
+
+        model_ids = lookup[corpus.token_ids[offsets[start]:offsets[end]]]
+        vectors = wv.vectors[model_ids[model_ids >= 0]]
+        segment_starts = (np.cumsum(block_counts) - block_counts)[block_valid]
+        lengths = block_counts[block_valid]
+
+        # Documents with the same number of known words are stacked and
+        # averaged together: mean over axis 1 of (n_docs, length, dim)
+        out = embeddings[row:row + len(block_valid)]
+        for length in np.unique(lengths):
+            group = np.flatnonzero(lengths == length)
+            rows = segment_starts[group, None] + np.arange(length)
+            out[group] = np.mean(vectors[rows], axis=1)
+        row += len(block_valid)
+
+    if output_path is not None:
+        embeddings.flush()
+
+    return embeddings, valid_indices.tolist()
+
+
+class EpochThroughputLogger(CallbackAny2Vec):
+    """
+    Word2Vec callback reporting training throughput for every epoch
+    """
+
+    def __init__(self):
+        """Initialize per-epoch counters"""
+        self.epoch = 0
+        self.start_time = None
+        self.words_per_sec = []
+
+    def on_epoch_begin(self, model):
+        """Start the epoch timer"""
+        self.start_time = time.perf_counter()
+
+    def on_epoch_end(self, model):
+        """Record and print words/sec for the finished epoch"""
+        elapsed = time.perf_counter() - self.start_time
+        rate = model.corpus_total_words / elapsed if elapsed > 0 else float('inf')
+        self.words_per_sec.append(rate)
+        self.epoch += 1
+        print(f"  Epoch {self.epoch}/{model.epochs}: {elapsed:.2f}s, {rate:,.0f} words/sec")
+
+
+def _write_corpus_file(corpus, cache):
+    """
+    Write the corpus once as a line-delimited file for corpus_file training
+
+    Args:
+        corpus: TokenCorpus to write
+        cache: ArtifactCache to keep the file in, or None for a temporary file
+
+    Returns:
+        tuple: (path, is_temporary)
+    """
+    if cache is None:
+        fd, path = tempfile.mkstemp(suffix='.txt', prefix='corpus-')
+        os.close(fd)
+        corpus.write_lines(path)
+        return path, True
+
+    key = 'lines-' + corpus.fingerprint()
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache.put(key, lambda directory: corpus.write_lines(
+            os.path.join(directory, _CORPUS_LINES_FILENAME)
+        ))
+    return os.path.join(entry, _CORPUS_LINES_FILENAME), False
+
+
+def _model_cache_key(corpus, params):
+    """
+    Cache key for a Word2Vec model trained on corpus with params
+
+    Args:
+        corpus: TokenCorpus the model is trained on
+        params: Dict of training hyperparameters
+
+    Returns:
+        str: Entry key combining the corpus hash and hyperparameters
+    """
+    digest = hashlib.sha256(corpus.fingerprint().encode('ascii'))
+    digest.update(repr(sorted(params.items())).encode('utf-8'))
+    return 'w2v-' + digest.hexdigest()
+
+
+def train_word2vec(corpus, vector_size=300, window=5, min_count=2, epochs=10, cache_dir=None,
+                   workers=None, use_corpus_file=False, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
+    """
+    Train a Word2Vec model, or reload an identical one from the disk cache
+
+    Models are cached under a key derived from the corpus content, the
+    hyperparameters and the training mode (use_corpus_file). Every numpy array is saved to its own .npy file,
+    so a cached model is reloaded with mmap='r': the word vectors stay
+    in the page cache and are shared by all processes using them instead
+    of being copied into each one.
+
+    With use_corpus_file=True the corpus is written once to a
+    line-delimited file and trained through gensim's corpus_file path,
+    which reads the file in every worker thread without going through the
+    Python iterator and scales close to linearly with cores.
+
+    Args:
+        corpus: TokenCorpus of tokenized texts
+        vector_size: Dimensionality of word vectors (default: 300)
+        window: Context window size (default: 5)
+        min_count: Ignore words with lower total frequency (default: 2)
+        epochs: Training epochs (default: 10)
+        cache_dir: Model cache directory; None disables caching (default: None)
+        workers: Training threads; None uses all CPU cores (default: None)
+        use_corpus_file: Train from a line-delimited corpus file (default: False)
+        max_cache_bytes: Size limit of the cache directory (default: 2 GB)
+
+    Returns:
+        Word2Vec: Trained (or reloaded, read-only) model
+    """
+    params = dict(vector_size=vector_size, window=window, min_count=min_count, epochs=epochs)
 
+    cache = None
+    if cache_dir is not None:
+        cache = ArtifactCache(cache_dir, max_cache_bytes)
+        key = _model_cache_key(corpus, dict(params, use_corpus_file=use_corpus_file))
+        entry = cache.get(key)
+        if entry is not None:
+            print(f"  Loaded cached model (memory-mapped): {entry}")
+            return Word2Vec.load(os.path.join(entry, _MODEL_FILENAME), mmap='r')
 
-def texts_to_embeddings(texts, vector_size=300):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    throughput = EpochThroughputLogger()
+
+    if use_corpus_file:
+        corpus_path, is_temporary = _write_corpus_file(corpus, cache)
+        print(f"  Training from corpus file with {workers} workers: {corpus_path}")
+        try:
+            w2v_model = Word2Vec(corpus_file=corpus_path, workers=workers, callbacks=[throughput], **params)
+        finally:
+            if is_temporary:
+                os.remove(corpus_path)
+    else:
+        print(f"  Training from in-memory corpus with {workers} workers")
+        w2v_model = Word2Vec(sentences=corpus, workers=workers, callbacks=[throughput], **params)
+
+    # Callbacks are only needed during training; keep them out of saved models
+    w2v_model.callbacks = ()
+    print(f"  Mean throughput: {np.mean(throughput.words_per_sec):,.0f} words/sec")
+
+    if cache is not None:
+        entry = cache.put(key, lambda directory: w2v_model.save(
+            os.path.join(directory, _MODEL_FILENAME), sep_limit=0
+        ))
+        print(f"  Cached model: {entry}")
+
+    return w2v_model
+
+
+def load_pretrained_vectors(path, vector_size=None, cache_dir=None, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
+    """
+    Load pretrained word vectors memory-mapped
+
+    Gensim KeyedVectors files (saved with KeyedVectors.save) are opened
+    directly with mmap='r'. Files in the word2vec C format (.bin, .txt,
+    .vec, optionally gzipped) cannot be memory-mapped, so they are parsed
+    once and converted into the cache directory; later runs map the
+    converted copy, which keeps startup fast for multi-GB vector files.
+
+    Args:
+        path: Path to a KeyedVectors file or a word2vec-format file
+        vector_size: Expected dimensionality; None skips the check (default: None)
+        cache_dir: Directory for converted word2vec-format files; None parses
+            them on every call (default: None)
+        max_cache_bytes: Size limit of the cache directory (default: 2 GB)
+
+    Returns:
+        KeyedVectors: The loaded word vectors
+
+    Raises:
+        ValueError: If the vectors do not have vector_size dimensions
+    """
+    if not path.lower().endswith(_WORD2VEC_FORMAT_EXTENSIONS):
+        wv = KeyedVectors.load(path, mmap='r')
+    else:
+        binary = '.bin' in os.path.basename(path).lower()
+        if cache_dir is None:
+            wv = KeyedVectors.load_word2vec_format(path, binary=binary)
+        else:
+            cache = ArtifactCache(cache_dir, max_cache_bytes)
+            stat = os.stat(path)
+            key = 'kv-' + hashlib.sha256(
+                repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns)).encode('utf-8')
+            ).hexdigest()
+            entry = cache.get(key)
+            if entry is None:
+                print(f"  Converting {path} to memory-mappable KeyedVectors...")
+                entry = cache.put(key, lambda directory: KeyedVectors.load_word2vec_format(
+                    path, binary=binary
+                ).save(os.path.join(directory, _VECTORS_FILENAME), sep_limit=0))
+            wv = KeyedVectors.load(os.path.join(entry, _VECTORS_FILENAME), mmap='r')
+
+    if vector_size is not None and wv.vector_size != vector_size:
+        raise ValueError(
+            f"Pretrained vectors have {wv.vector_size} dimensions, expected {vector_size}"
+        )
+
+    return wv
+
+
+def texts_to_embeddings(texts, vector_size=300, cache_dir=None, window=5, min_count=2, epochs=10,
+                        pretrained_vectors=None, embeddings_path=None, workers=None,
+                        use_corpus_file=False, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
     """
     Convert texts to vector embeddings using Word2Vec
 
     Args:
         texts: List of raw text strings
         vector_size: Dimensionality of word vectors (default: 300)
+        cache_dir: Directory for cached corpora and models; None disables caching
+        window: Word2Vec context window size (default: 5)
+        min_count: Ignore words with lower total frequency (default: 2)
+        epochs: Word2Vec training epochs (default: 10)
+        pretrained_vectors: Path to pretrained word vectors; when given, training
+            is skipped and these vectors are pooled instead (default: None)
+        embeddings_path: .npy file to write the document embeddings into as an
+            out-of-core float32 memmap; None keeps them in memory (default: None)
+        workers: Word2Vec training threads; None uses all CPU cores (default: None)
+        use_corpus_file: Train Word2Vec through gensim's multi-core corpus_file
+            mode instead of the in-memory iterator (default: False)
+        max_cache_bytes: Size limit of the cache directory, shared by the
+            corpus, model and vector caches (default: 2 GB)
 
     Returns:
         tuple: (embeddings, tokenized_texts, valid_indices, w2v_model)
-            - embeddings: numpy array of shape (n_texts, vector_size)
-            - tokenized_texts: list of tokenized texts
+            - embeddings: float32 numpy array (np.memmap when embeddings_path
+              is given) of shape (n_texts, vector_size)
+            - tokenized_texts: TokenCorpus of the non-empty tokenized texts
             - valid_indices: indices of texts with valid embeddings
-            - w2v_model: trained Word2Vec model
+            - w2v_model: trained (or cached) Word2Vec model, or the pretrained
+              KeyedVectors when pretrained_vectors is given
     """
     print(f"\n{'='*60}")
     print("WORD2VEC EMBEDDING GENERATION")
     print(f"{'='*60}")
 
-    # Preprocess texts
+    # Preprocess texts into a compact integer-ID corpus, removing empty texts
     print("\nPreprocessing texts...")
-    cleaned_texts = [clean_text(text) for text in texts]
-    tokenized_texts = [tokenize_text(text) for text in cleaned_texts]
-
-    # Remove empty texts
-    tokenized_texts = [text for text in tokenized_texts if len(text) > 0]
+    tokenized_texts = build_corpus(texts, cache_dir=cache_dir, max_cache_bytes=max_cache_bytes)
     print(f"  Total texts after cleaning: {len(tokenized_texts)}")
 
-    # Train Word2Vec model
-    print(f"\nTraining Word2Vec model (vector_size={vector_size})...")
-    w2v_model = Word2Vec(
-        sentences=tokenized_texts,
-        vector_size=vector_size,
-        window=5,
-        min_count=2,
-        workers=4,
-        epochs=10
-    )
-    print(f"  Vocabulary size: {len(w2v_model.wv)}")
+    if pretrained_vectors is not None:
+        # Use pretrained vectors as-is
+        print(f"\nLoading pretrained word vectors: {pretrained_vectors}")
+        w2v_model = load_pretrained_vectors(pretrained_vectors, vector_size=vector_size, cache_dir=cache_dir,
+                                            max_cache_bytes=max_cache_bytes)
+        wv = w2v_model
+    else:
+        # Train Word2Vec model
+        print(f"\nTraining Word2Vec model (vector_size={vector_size})...")
+        w2v_model = train_word2vec(
+            tokenized_texts,
+            vector_size=vector_size,
+            window=window,
+            min_count=min_count,
+            epochs=epochs,
+            cache_dir=cache_dir,
+            workers=workers,
+            use_corpus_file=use_corpus_file,
+            max_cache_bytes=max_cache_bytes
+        )
+        wv = w2v_model.wv
+    print(f"  Vocabulary size: {len(wv)}")
 
     # Convert texts to document vectors (average of word vectors)
     print("\nConverting texts to document vectors...")
-    text_vectors = []
-    valid_indices = []
-
-    for idx, text in enumerate(tokenized_texts):
-        word_vectors = []
-        for word in text:
-            if word in w2v_model.wv:
-                word_vectors.append(w2v_model.wv[word])
-
-        if len(word_vectors) > 0:
-            # Average pooling of word vectors
-            text_vector = np.mean(word_vectors, axis=0)
-            text_vectors.append(text_vector)
-            valid_indices.append(idx)
-
-    embeddings = np.array(text_vectors)
+    embeddings, valid_indices = pool_document_vectors(tokenized_texts, wv, output_path=embeddings_path)
     print(f"  Final embeddings shape: {embeddings.shape}")
 
     return embeddings, tokenized_texts, valid_indices, w2v_model
+
+
+def update_embeddings(new_texts, model, corpus, embeddings, valid_indices, epochs=None,
+                      cache_dir=None, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
+    """
+    Incrementally add a batch of new texts to an existing Word2Vec model
+
+    The model vocabulary is extended with the new batch
+    (build_vocab(update=True)) and the model is trained on the new
+    sentences only. Training only moves the vectors of words that occur
+    in the new batch, so only old documents containing one of those words
+    are re-pooled, together with the new documents; every other embedding
+    row is reused as-is. Common words occur in nearly every batch, so the
+    re-pooled share of old documents is often large, and the combined
+    corpus is rebuilt in full: a refresh saves retraining on the history,
+    but its cost still grows with the history.
+
+    Args:
+        new_texts: List of raw text strings to add
+        model: Word2Vec model or path to a saved one; it must be writable
+            (not loaded with mmap='r')
+        corpus: TokenCorpus the previous embeddings were computed from
+        embeddings: Previous document embeddings (rows follow valid_indices)
+        valid_indices: Previous indices of documents with valid embeddings
+        epochs: Epochs over the new batch; None uses model.epochs (default: None)
+        cache_dir: Directory for cached preprocessing results (default: None)
+        max_cache_bytes: Size limit of the cache directory (default: 2 GB)
+
+    Returns:
+        tuple: (embeddings, tokenized_texts, valid_indices, w2v_model) for the
+            combined corpus (old documents first, then the new batch), in the
+            same format as texts_to_embeddings
+
+    Raises:
+        ValueError: If the model's vectors are read-only
+    """
+    print(f"\n{'='*60}")
+    print("INCREMENTAL WORD2VEC UPDATE")
+    print(f"{'='*60}")
+
+    if isinstance(model, str):
+        model = Word2Vec.load(model)
+    if not model.wv.vectors.flags.writeable:
+        raise ValueError("Model vectors are read-only (memory-mapped); "
+                         "load the model without mmap to update it")
+
+    print("\nPreprocessing new texts...")
+    new_corpus = build_corpus(new_texts, cache_dir=cache_dir, max_cache_bytes=max_cache_bytes)
+    print(f"  New texts after cleaning: {len(new_corpus)}")
+
+    # Extend the vocabulary and train on the new sentences only
+    print("\nUpdating Word2Vec model...")
+    old_vocab_size = len(model.wv)
+    model.build_vocab(new_corpus, update=True)
+    throughput = EpochThroughputLogger()
+    model.train(
+        corpus_iterable=new_corpus,
+        total_examples=len(new_corpus),
+        epochs=epochs or model.epochs,
+        callbacks=[throughput]
+    )
+    print(f"  Vocabulary size: {old_vocab_size} -> {len(model.wv)}")
+
+    combined = corpus.concat(new_corpus)
+    n_old_docs = len(corpus)
+    n_old_tokens = corpus.n_tokens
+
+    # Words whose vectors may have moved: model words occurring in the new batch
+    touched = np.zeros(len(combined.words), dtype=bool)
+    touched[combined.token_ids[n_old_tokens:]] = True
+    touched &= np.fromiter(
+        (word in model.wv.key_to_index for word in combined.words),
+        dtype=bool, count=len(combined.words)
+    )
+
+    # Old documents containing at least one touched word
+    hits = np.concatenate(([0], np.cumsum(touched[combined.token_ids[:n_old_tokens]])))
+    old_offsets = combined.offsets[:n_old_docs + 1]
+    affected = np.flatnonzero(hits[old_offsets[1:]] - hits[old_offsets[:-1]])
+    print(f"  Re-pooling {len(affected)} of {n_old_docs} previous documents "
+          f"and {len(new_corpus)} new documents")
+
+    # Pool affected and new documents only
+    repool = np.concatenate((affected, np.arange(n_old_docs, len(combined))))
+    repooled_embeddings, repooled_valid = pool_document_vectors(combined.subset(repool), model.wv)
+    repooled_docs = repool[repooled_valid]
+
+    # Merge reused and re-pooled rows in document order
+    old_valid = np.asarray(valid_indices, dtype=np.int64)
+    keep = ~np.isin(old_valid, repooled_docs)
+    new_valid = np.union1d(old_valid[keep], repooled_docs)
+
+    updated = np.empty((len(new_valid), model.wv.vector_size), dtype=np.float32)
+    updated[np.searchsorted(new_valid, old_valid[keep])] = embeddings[np.flatnonzero(keep)]
+    updated[np.searchsorted(new_valid, repooled_docs)] = repooled_embeddings
+    print(f"  Final embeddings shape: {updated.shape}")
+
+    return updated, combined, new_valid.tolist(), model
@@ -0,0 +1,221 @@
+"""
+Process-pool helpers shared by the batch text utilities and the pipeline
+"""
+
+import contextlib
+import io
+import mmap
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def resolve_n_jobs(n_jobs):
+    """
+    Translate an n_jobs setting into a worker count
+
+    Args:
+        n_jobs: None or 1 for serial, -1 for all cores, or a positive count
+
+    Returns:
+        int: Number of worker processes to use (at least 1)
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def iter_chunks(items, chunk_size):
+    """
+    Split a sequence into consecutive slices
+
+    Args:
+        items: Any sliceable sequence (list, numpy array, ...)
+        chunk_size: Maximum number of items per slice
+
+    Yields:
+        Consecutive slices of items
+    """
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def share_array(X):
+    """
+    Describe an array so worker processes can read it without pickling it
+
+    An np.memmap backed by a file is re-opened by path; any other array is
+    copied once into a shared memory block.
+
+    Args:
+        X: numpy array or np.memmap
+
+    Returns:
+        tuple: (source, block) - source is ('memmap', filename, dtype, shape,
+            offset, order) or ('shm', name, dtype, shape) for
+            open_shared_array(); block is the SharedMemory the caller must
+            close() and unlink() once the workers are done, or None
+    """
+    if isinstance(X, np.memmap) and isinstance(X.base, mmap.mmap):
+        order = 'F' if X.flags.f_contiguous and not X.flags.c_contiguous else 'C'
+        return ('memmap', X.filename, X.dtype.str, X.shape, X.offset, order), None
+
+    X = np.ascontiguousarray(X)
+    block = shared_memory.SharedMemory(create=True, size=max(X.nbytes, 1))
+    np.ndarray(X.shape, dtype=X.dtype, buffer=block.buf)[:] = X
+    return ('shm', block.name, X.dtype.str, X.shape), block
+
+
+def open_shared_array(source):
+    """
+    Open an array described by share_array() (worker process)
+
+    Args:
+        source: Descriptor returned by share_array()
+
+    Returns:
+        tuple: (X, block) - the array, and the attached SharedMemory or None;
+            drop every reference to X before calling block.close()
+    """
+    if source[0] == 'memmap':
+        _, filename, dtype, shape, offset, order = source
+        return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape, order=order), None
+    _, name, dtype, shape = source
+    block = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf), block
+
+
+def parallel_map(func, chunks, n_jobs=1, initializer=None, initargs=()):
+    """
+    Apply func to each chunk, optionally across a process pool
+
+    Results are returned in input order, so output is identical to the
+    serial path regardless of the number of workers.
+
+    Args:
+        func: Picklable callable applied to each chunk
+        chunks: Iterable of work items
+        n_jobs: Number of worker processes (see resolve_n_jobs, default: 1)
+        initializer: Callable run once per worker before any chunk, e.g. to
+            ship large read-only data once instead of with every chunk; the
+            serial path runs it once in this process (default: None)
+        initargs: Arguments for initializer (default: ())
+
+    Returns:
+        list: func(chunk) for each chunk, in order
+    """
+    chunks = list(chunks)
+    n_workers = min(resolve_n_jobs(n_jobs), len(chunks))
+    if n_workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, chunks))
+
+
+def _stage_order(stages):
+    """
+    Order stages so that every stage follows its dependencies
+
+    Ties keep the insertion order of stages.
+
+    Args:
+        stages: dict of name -> (func, dependencies)
+
+    Returns:
+        list: Stage names in execution order
+
+    Raises:
+        ValueError: On unknown dependencies or dependency cycles
+    """
+    for name, (_, dependencies) in stages.items():
+        unknown = [dep for dep in dependencies if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {unknown}")
+
+    order = []
+    done = set()
+    while len(order) < len(stages):
+        ready = [name for name, (_, dependencies) in stages.items()
+                 if name not in done and all(dep in done for dep in dependencies)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among stages {sorted(set(stages) - done)}")
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+def _run_stage(func, args):
+    """Run one stage in a worker, returning (result, captured stdout, seconds)"""
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            result = func(*args)
+    except BaseException:
+        # Emit the log of a failing stage before its exception reaches the parent
+        print(buffer.getvalue(), end='', flush=True)
+        raise
+    return result, buffer.getvalue(), time.perf_counter() - start
+
+
+def run_stages(stages, n_jobs=1):
+    """
+    Run a dependency graph of stages, each as soon as its inputs are ready
+
+    Every stage is called with the results of its dependencies as
+    positional arguments. With several workers, independent stages run
+    concurrently in a process pool. Each stage's output is printed in one
+    block when the stage finishes (or fails), so concurrent logs do not
+    interleave.
+
+    Args:
+        stages: dict of name -> (func, dependencies); func must be picklable
+            (a module-level function or functools.partial of one) and
+            dependencies is a tuple of stage names
+        n_jobs: Number of worker processes (see resolve_n_jobs); 1 runs the
+            stages in dependency order in this process (default: 1)
+
+    Returns:
+        tuple: (results, seconds) - dicts of stage name -> return value and
+            stage name -> wall time of the stage
+
+    Raises:
+        ValueError: On unknown dependencies or dependency cycles
+    """
+    order = _stage_order(stages)
+    results = {}
+    seconds = {}
+    n_workers = min(resolve_n_jobs(n_jobs), len(stages))
+
+    if n_workers <= 1:
+        for name in order:
+            func, dependencies = stages[name]
+            start = time.perf_counter()
+            results[name] = func(*[results[dep] for dep in dependencies])
+            seconds[name] = time.perf_counter() - start
+        return results, seconds
+
+    pending = list(order)
+    running = {}
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        while pending or running:
+            for name in [name for name in pending if all(dep in results for dep in stages[name][1])]:
+                func, dependencies = stages[name]
+                future = executor.submit(_run_stage, func, [results[dep] for dep in dependencies])
+                running[future] = name
+                pending.remove(name)
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                results[name], output, seconds[name] = future.result()
+                print(output, end='')
+    return results, seconds
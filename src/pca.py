@@ -2,7 +2,299 @@
 Manual PCA implementation from scratch
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from .parallel import open_shared_array, parallel_map, resolve_n_jobs, share_array
+
+
+def _eigen_full(cov_matrix, n_components, random_state):
+    """
+    Full symmetric eigendecomposition (LAPACK eigh)
+
+    Returns every eigenpair; cost is O(d^3) but there is no complex
+    arithmetic and results are exactly real and orthonormal.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(cov_matrix)
+    return eigenvalues[::-1], eigenvectors[:, ::-1]
+
+
+def _eigen_arpack(cov_matrix, n_components, random_state):
+    """
+    Top-k eigenpairs with the implicitly restarted Lanczos method (ARPACK)
+
+    Only matrix-vector products with the covariance are needed, so the
+    cost grows with k rather than with the full spectrum.
+    """
+    rng = np.random.default_rng(random_state)
+    v0 = rng.uniform(-1, 1, cov_matrix.shape[0])
+    eigenvalues, eigenvectors = eigsh(cov_matrix, k=n_components, which='LA', v0=v0)
+    idx = eigenvalues.argsort()[::-1]
+    return eigenvalues[idx], eigenvectors[:, idx]
+
+
+def _eigen_randomized(cov_matrix, n_components, random_state, n_oversamples=10, n_iter=7):
+    """
+    Top-k eigenpairs with a randomized range finder
+
+    A Gaussian test matrix is multiplied by the covariance with a few
+    QR-stabilized power iterations to find an orthonormal basis Q of its
+    dominant range; the small matrix Q^T C Q is then diagonalized exactly.
+    """
+    rng = np.random.default_rng(random_state)
+    n_features = cov_matrix.shape[0]
+    size = min(n_components + n_oversamples, n_features)
+
+    Q, _ = np.linalg.qr(cov_matrix @ rng.standard_normal((n_features, size)))
+    for _ in range(n_iter):
+        Q, _ = np.linalg.qr(cov_matrix @ Q)
+
+    eigenvalues, small_vectors = np.linalg.eigh(Q.T @ (cov_matrix @ Q))
+    eigenvalues = eigenvalues[::-1][:n_components]
+    eigenvectors = (Q @ small_vectors[:, ::-1])[:, :n_components]
+    return eigenvalues, eigenvectors
+
+
+def _as_rows(X, n_columns, name):
+    """
+    Treat a 1-D vector as a single row and check the number of columns
+
+    Args:
+        X: Array-like of shape (n_rows, n_columns) or (n_columns,)
+        n_columns: Expected number of columns
+        name: Description of the columns for error messages
+
+    Returns:
+        X with two dimensions
+
+    Raises:
+        ValueError: If X is not 1-D or 2-D or has the wrong number of columns
+    """
+    if not sparse.issparse(X) and not hasattr(X, 'ndim'):
+        X = np.asarray(X)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.ndim != 2:
+        raise ValueError(f"Expected a 1-D or 2-D array, got {X.ndim} dimensions")
+    if X.shape[1] != n_columns:
+        raise ValueError(f"Expected {n_columns} {name}, got {X.shape[1]}")
+    return X
+
+
+def _flip_signs(components):
+    """
+    Make the largest-magnitude weight of every component positive
+
+    Eigenvectors are only defined up to sign; fixing it makes results
+    identical across solvers and runs.
+
+    Args:
+        components: Matrix of shape (n_features, n_components)
+
+    Returns:
+        Components with deterministic signs
+    """
+    rows = np.argmax(np.abs(components), axis=0)
+    signs = np.sign(components[rows, np.arange(components.shape[1])])
+    signs[signs == 0] = 1
+    return components * signs
+
+
+# Eigensolver backends selectable via ManualPCA(solver=...)
+EIGEN_SOLVERS = {
+    'full': _eigen_full,
+    'arpack': _eigen_arpack,
+    'randomized': _eigen_randomized,
+}
+
+
+def _choose_solver(n_features, n_components):
+    """
+    Pick an eigensolver for solver='auto'
+
+    Small problems, or requests for most of the spectrum, use the full
+    symmetric solver; otherwise only the top components are computed
+    with ARPACK.
+
+    Args:
+        n_features: Dimensionality of the covariance matrix
+        n_components: Number of components requested
+
+    Returns:
+        str: Solver name
+    """
+    if n_features <= 500 or n_components >= 0.8 * n_features:
+        return 'full'
+    return 'arpack'
+
+
+def _choose_method(n_samples, n_features):
+    """
+    Pick the matrix to diagonalize for method='auto'
+
+    With fewer samples than features the n x n Gram matrix is smaller than
+    the d x d covariance matrix and has the same non-zero spectrum.
+
+    Args:
+        n_samples: Number of rows
+        n_features: Number of columns
+
+    Returns:
+        str: 'gram' or 'covariance'
+    """
+    return 'gram' if n_samples < n_features else 'covariance'
+
+
+def _centered_covariance_operator(X, mean):
+    """
+    Covariance of a sparse matrix as a LinearOperator, centered implicitly
+
+    C v = (X^T (X v) - n * mean * (mean^T v)) / (n - 1), so only sparse
+    products with X are needed and the dense centered matrix X - mean is
+    never formed.
+
+    Args:
+        X: scipy.sparse CSR matrix of shape (n_samples, n_features)
+        mean: Column means of X
+
+    Returns:
+        LinearOperator: Symmetric (n_features, n_features) operator
+    """
+    n_samples, n_features = X.shape
+
+    def matmat(V):
+        V = np.asarray(V, dtype=np.float64)
+        return (X.T @ (X @ V) - n_samples * np.outer(mean, mean @ V)) / (n_samples - 1)
+
+    def matvec(v):
+        return matmat(np.reshape(v, (-1, 1))).ravel()
+
+    return LinearOperator(
+        (n_features, n_features), matvec=matvec, rmatvec=matvec,
+        matmat=matmat, rmatmat=matmat, dtype=np.float64,
+    )
+
+
+class _ScatterAccumulator:
+    """
+    Running row count, column sums and scatter matrix of a data stream
+
+    Rows are accumulated relative to a fixed shift vector (ideally close to
+    the data mean), so that the covariance recovered from the raw sums
+    does not suffer from catastrophic cancellation.
+    """
+
+    def __init__(self, shift):
+        """
+        Initialize an empty accumulator
+
+        Args:
+            shift: Vector subtracted from every row before accumulating
+        """
+        self.shift = np.asarray(shift, dtype=np.float64)
+        n_features = self.shift.shape[0]
+        self.n_samples = 0
+        self.sums = np.zeros(n_features)
+        self.scatter = np.zeros((n_features, n_features))
+
+    def update(self, block):
+        """
+        Add a block of rows
+
+        Args:
+            block: Array of shape (n_rows, n_features)
+        """
+        block = block - self.shift
+        self.n_samples += block.shape[0]
+        self.sums += block.sum(axis=0)
+        self.scatter += np.dot(block.T, block)
+
+    def merge(self, other):
+        """
+        Add the statistics of another accumulator (any shift)
+
+        Args:
+            other: _ScatterAccumulator over different rows
+        """
+        # Re-express the other sums relative to this shift: x - s = y + c
+        c = other.shift - self.shift
+        cross = np.outer(c, other.sums)
+        self.scatter += other.scatter + cross + cross.T + other.n_samples * np.outer(c, c)
+        self.sums += other.sums + other.n_samples * c
+        self.n_samples += other.n_samples
+
+    @property
+    def mean(self):
+        """Mean of all accumulated rows"""
+        return self.shift + self.sums / self.n_samples
+
+    def covariance(self):
+        """
+        Sample covariance matrix of all accumulated rows
+
+        Returns:
+            Matrix of shape (n_features, n_features)
+
+        Raises:
+            ValueError: If fewer than two rows were accumulated
+        """
+        if self.n_samples < 2:
+            raise ValueError(f"At least 2 samples are needed for PCA, got {self.n_samples}")
+        delta = self.sums / self.n_samples
+        return (self.scatter - self.n_samples * np.outer(delta, delta)) / (self.n_samples - 1)
+
+
+def _scatter_shard(task):
+    """
+    Accumulate the scatter statistics of one row shard (worker process)
+
+    The data is never pickled: the worker re-opens the memmap file or
+    attaches to the shared memory block and reads only its own rows.
+
+    Args:
+        task: Tuple (source, start, stop, batch_size, shift) where source
+            is a descriptor from src.parallel.share_array()
+
+    Returns:
+        _ScatterAccumulator: Statistics of rows start:stop
+    """
+    source, start, stop, batch_size, shift = task
+    X, block = open_shared_array(source)
+    try:
+        accumulator = _ScatterAccumulator(shift)
+        for block_start in range(start, stop, batch_size):
+            accumulator.update(X[block_start:min(block_start + batch_size, stop)])
+        return accumulator
+    finally:
+        del X
+        if block is not None:
+            block.close()
+
+
+def _tree_reduce(accumulators):
+    """
+    Merge accumulators pairwise, level by level
+
+    Pairwise merging keeps the summation depth logarithmic in the number
+    of shards, which bounds the rounding error of the combined sums.
+
+    Args:
+        accumulators: Non-empty list of _ScatterAccumulator
+
+    Returns:
+        _ScatterAccumulator: Statistics of all shards
+    """
+    while len(accumulators) > 1:
+        merged = []
+        for i in range(0, len(accumulators), 2):
+            if i + 1 < len(accumulators):
+                accumulators[i].merge(accumulators[i + 1])
+            merged.append(accumulators[i])
+        accumulators = merged
+    return accumulators[0]
 
 
 class ManualPCA:
@@ -15,85 +307,561 @@ class ManualPCA:
     3. Calculating eigenvalues and eigenvectors
     4. Selecting top n components
     5. Projecting data onto principal components
+
+    The eigendecomposition in step 3 is pluggable (see EIGEN_SOLVERS):
+    the covariance matrix is symmetric, so the full solver uses eigh,
+    and the iterative solvers compute only the top n components.
+    Whatever the solver, eigenvalues_ holds the n_components leading
+    eigenvalues (the variance along each component) and total_variance_
+    the trace of the covariance, so explained_variance_ratio_ is
+    eigenvalues_ / total_variance_.
+
+    Data larger than memory can be streamed with partial_fit(), which
+    only keeps the row count, column sums and scatter matrix; finalize()
+    then solves for the components and transform() projects in blocks.
     """
 
-    def __init__(self, n_components=3):
+    def __init__(self, n_components=3, batch_size=8192, solver='auto', random_state=0,
+                 method='auto', n_threads=1, n_jobs=1, verbose=True):
         """
         Initialize PCA
 
         Args:
             n_components: Number of principal components to keep (default: 3)
+            batch_size: Rows processed at a time, so inputs such as np.memmap
+                embeddings are never copied or centered in full (default: 8192)
+            solver: Eigensolver - 'full' (symmetric eigh), 'arpack' (Lanczos,
+                top k only), 'randomized' (randomized range finder) or 'auto'
+                (default: 'auto')
+            random_state: Seed for the iterative solvers (default: 0)
+            method: Matrix to diagonalize - 'covariance' (d x d), 'gram' (n x n,
+                cheaper when n_samples < n_features) or 'auto' (default: 'auto')
+            n_threads: Threads accumulating row blocks; -1 uses all cores (default: 1)
+            n_jobs: Worker processes for the covariance pass; each process
+                accumulates one row shard of X (see fit()); -1 uses all cores
+                (default: 1)
+            verbose: Print progress for every step (default: True)
         """
+        if solver != 'auto' and solver not in EIGEN_SOLVERS:
+            choices = ', '.join(repr(name) for name in ['auto', *EIGEN_SOLVERS])
+            raise ValueError(f"Unknown solver '{solver}'; choose from {choices}")
+        if method not in ('auto', 'covariance', 'gram'):
+            raise ValueError(f"Unknown method '{method}'; choose from 'auto', 'covariance', 'gram'")
+
         self.n_components = n_components
+        self.batch_size = batch_size
+        self.solver = solver
+        self.random_state = random_state
+        self.method = method
+        self.n_threads = n_threads
+        self.n_jobs = n_jobs
+        self.verbose = verbose
         self.components_ = None
         self.mean_ = None
         self.eigenvalues_ = None
+        self.total_variance_ = None
         self.explained_variance_ratio_ = None
+        self._accumulator = None
+        self._n_chunks = 0
 
-    def fit_transform(self, X):
+    def _log(self, message):
+        """Print a progress message unless verbose is off"""
+        if self.verbose:
+            print(message)
+
+    @property
+    def n_samples_seen_(self):
+        """Number of rows passed to partial_fit() so far"""
+        return 0 if self._accumulator is None else self._accumulator.n_samples
+
+    def _iter_blocks(self, X):
+        """Yield (start, block) pairs of at most batch_size rows"""
+        for start in range(0, X.shape[0], self.batch_size):
+            yield start, X[start:start + self.batch_size]
+
+    def _solve(self, matrix, X=None, total_variance=None):
         """
-        Fit PCA and transform data
+        Steps 3-4: eigendecomposition and component selection
 
         Args:
-            X: Input data matrix of shape (n_samples, n_features)
+            matrix: Covariance matrix (n_features x n_features), or the Gram
+                matrix scaled by 1/(n - 1) (n_samples x n_samples) when X is given
+            X: Data the Gram matrix was built from, used to map its
+                eigenvectors back to feature space (default: None)
+            total_variance: Trace of the covariance; required when matrix is
+                a LinearOperator (default: np.trace(matrix))
+        """
+        # Step 3: Calculate eigenvalues and eigenvectors (sorted descending)
+        solver = self.solver
+        if solver == 'auto' and isinstance(matrix, LinearOperator):
+            solver = 'arpack'
+        elif solver == 'auto':
+            solver = _choose_solver(matrix.shape[0], self.n_components)
+        self._log(f"\nStep 3: Calculating eigenvalues and eigenvectors (solver='{solver}')...")
+        eigenvalues, eigenvectors = EIGEN_SOLVERS[solver](matrix, self.n_components, self.random_state)
+
+        self.eigenvalues_ = eigenvalues[:self.n_components]
+        self._log(f"  Number of eigenvalues: {len(eigenvalues)}")
+        self._log(f"  Top 5 eigenvalues: {eigenvalues[:5]}")
+
+        # Step 4: Select top n principal components
+        self._log(f"\nStep 4: Selecting top {self.n_components} principal components...")
+        components = eigenvectors[:, :self.n_components]
+        if X is not None:
+            components = self._gram_to_components(X, components, eigenvalues[:self.n_components])
+        self.components_ = _flip_signs(components)
+        self._log(f"  Components shape: {self.components_.shape}")
+
+        # Calculate explained variance ratio; the total variance is the trace
+        # of the covariance matrix (equal to that of the scaled Gram matrix),
+        # so the full spectrum is never needed
+        if total_variance is None:
+            total_variance = np.trace(matrix)
+        self.total_variance_ = float(total_variance)
+        self.explained_variance_ratio_ = self.eigenvalues_ / self.total_variance_
+        self._log(f"\n  Explained variance ratio:")
+        for i, ratio in enumerate(self.explained_variance_ratio_):
+            self._log(f"    PC{i+1}: {ratio*100:.2f}%")
+        self._log(f"    Total: {np.sum(self.explained_variance_ratio_)*100:.2f}%")
+
+    def _accumulate_scatter(self, X):
+        """
+        Accumulate the scatter matrix of X in one pass over row blocks
+
+        Rows are split into one contiguous range per thread; each thread
+        adds its blocks to a private accumulator (BLAS releases the GIL), and
+        the accumulators are summed at the end. Centering is implicit: rows
+        are shifted by the mean of the first block and the exact mean is
+        corrected for when the covariance is formed, so no centered copy of
+        X is made and no separate pass for the mean is needed.
+
+        Args:
+            X: Data of shape (n_samples, n_features)
 
         Returns:
-            Transformed data of shape (n_samples, n_components)
+            _ScatterAccumulator: Statistics of all rows
+        """
+        n_samples = X.shape[0]
+        shift = np.mean(X[:self.batch_size], axis=0, dtype=np.float64)
+        n_blocks = -(-n_samples // self.batch_size)
+        n_threads = min(resolve_n_jobs(self.n_threads), n_blocks)
+
+        # Thread ranges start on block boundaries
+        bounds = [t * n_blocks // n_threads * self.batch_size for t in range(n_threads)] + [n_samples]
+
+        def accumulate(start, stop):
+            accumulator = _ScatterAccumulator(shift)
+            for block_start in range(start, stop, self.batch_size):
+                accumulator.update(X[block_start:min(block_start + self.batch_size, stop)])
+            return accumulator
+
+        if n_threads == 1:
+            return accumulate(0, n_samples)
+
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            accumulators = list(executor.map(accumulate, bounds[:-1], bounds[1:]))
+        total = accumulators[0]
+        for accumulator in accumulators[1:]:
+            total.merge(accumulator)
+        return total
+
+    def _accumulate_scatter_distributed(self, X, n_workers):
+        """
+        Accumulate the scatter matrix of X across worker processes
+
+        X is split into one contiguous row shard per worker. A memmap is
+        re-opened by file name in every worker; any other array is copied
+        once into a shared memory block that the workers attach to. Each
+        worker returns the row count, sums and scatter matrix of its shard,
+        and the results are combined with a pairwise tree reduction.
+
+        Args:
+            X: Data of shape (n_samples, n_features)
+            n_workers: Number of worker processes
+
+        Returns:
+            _ScatterAccumulator: Statistics of all rows
+        """
+        n_samples = X.shape[0]
+        shift = np.mean(X[:self.batch_size], axis=0, dtype=np.float64)
+        bounds = np.linspace(0, n_samples, n_workers + 1).astype(int)
+
+        source, block = share_array(X)
+        try:
+            tasks = [(source, start, stop, self.batch_size, shift)
+                     for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+            accumulators = parallel_map(_scatter_shard, tasks, n_jobs=n_workers)
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        return _tree_reduce(accumulators)
+
+    def _gram_matrix(self, X):
+        """
+        Centered Gram matrix (X - mean)(X - mean)^T, built from block pairs
+
+        Only two centered row blocks exist at a time; the upper block
+        triangle is computed and mirrored.
+
+        Args:
+            X: Data of shape (n_samples, n_features)
+
+        Returns:
+            Matrix of shape (n_samples, n_samples)
+        """
+        n_samples = X.shape[0]
+        gram = np.empty((n_samples, n_samples))
+        starts = range(0, n_samples, self.batch_size)
+
+        def fill_row(i):
+            block_i = X[i:i + self.batch_size] - self.mean_
+            for j in starts:
+                if j < i:
+                    continue
+                block_j = block_i if j == i else X[j:j + self.batch_size] - self.mean_
+                product = np.dot(block_i, block_j.T)
+                gram[i:i + self.batch_size, j:j + self.batch_size] = product
+                gram[j:j + self.batch_size, i:i + self.batch_size] = product.T
+
+        n_threads = min(resolve_n_jobs(self.n_threads), len(starts))
+        if n_threads == 1:
+            for i in starts:
+                fill_row(i)
+        else:
+            # Each row block writes a disjoint set of tiles
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                list(executor.map(fill_row, starts))
+        return gram
+
+    def _gram_to_components(self, X, vectors, eigenvalues):
+        """
+        Map eigenvectors U of the scaled Gram matrix to principal axes
+
+        The principal axes are (X - mean)^T U / sqrt((n - 1) * eigenvalue).
+
+        Args:
+            X: Data of shape (n_samples, n_features)
+            vectors: Gram eigenvectors of shape (n_samples, n_components)
+            eigenvalues: Matching eigenvalues
+
+        Returns:
+            Components of shape (n_features, n_components)
+        """
+        components = np.zeros((X.shape[1], vectors.shape[1]))
+        for start, block in self._iter_blocks(X):
+            components += np.dot((block - self.mean_).T, vectors[start:start + block.shape[0]])
+        scale = np.sqrt(np.maximum(eigenvalues * (X.shape[0] - 1), np.finfo(float).tiny))
+        return components / scale
+
+    def _project(self, X):
+        """
+        Step 5: project rows onto the components, one block at a time
+
+        Args:
+            X: Data of shape (n_samples, n_features), dense or scipy.sparse
+
+        Returns:
+            Projected data of shape (n_samples, n_components)
+        """
+        X_pca = np.empty((X.shape[0], self.n_components))
+        if sparse.issparse(X):
+            # Center after projecting, so sparse blocks are never densified
+            offset = self.mean_ @ self.components_
+            X = sparse.csr_matrix(X)
+            for start, block in self._iter_blocks(X):
+                X_pca[start:start + block.shape[0]] = block @ self.components_ - offset
+            return X_pca
+
+        for start, block in self._iter_blocks(X):
+            X_pca[start:start + block.shape[0]] = np.dot(block - self.mean_, self.components_)
+        return X_pca
+
+    def _fit_sparse(self, X):
+        """
+        Fit PCA on a scipy.sparse matrix without densifying it
+
+        The top components are computed by an iterative solver from an
+        implicitly centered covariance operator (see
+        _centered_covariance_operator), so memory stays proportional to the
+        number of non-zeros plus n_features x n_components.
+
+        Args:
+            X: scipy.sparse matrix of shape (n_samples, n_features)
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: If solver='full' is requested
+        """
+        if self.solver == 'full':
+            raise ValueError("solver='full' needs a dense covariance matrix; use 'arpack' or 'randomized' for sparse input")
+
+        X = sparse.csr_matrix(X)
+        if not X.has_canonical_format:
+            # Duplicate entries would be counted separately in the squared sum
+            X = X.copy()
+            X.sum_duplicates()
+        n_samples, n_features = X.shape
+
+        self._log(f"\n{'='*60}")
+        self._log("MANUAL PCA IMPLEMENTATION (SPARSE)")
+        self._log(f"{'='*60}")
+
+        # Step 1: Mean vector; X itself is never centered
+        self._log("\nStep 1: Calculating mean vector...")
+        self.mean_ = np.asarray(X.sum(axis=0, dtype=np.float64)).ravel() / n_samples
+        self._log(f"  Original data shape: {X.shape} ({X.nnz} non-zeros)")
+        self._log(f"  Mean vector shape: {self.mean_.shape}")
+
+        # Step 2: Covariance as an operator, centered inside each product
+        self._log("\nStep 2: Building implicitly centered covariance operator...")
+        cov_operator = _centered_covariance_operator(X, self.mean_)
+        data = X.data.astype(np.float64, copy=False)
+        squared_sum = np.dot(data, data)
+        total_variance = (squared_sum - n_samples * np.dot(self.mean_, self.mean_)) / (n_samples - 1)
+        self._log(f"  Covariance operator shape: {cov_operator.shape}")
+
+        # Steps 3-4: Eigendecomposition and component selection
+        self._solve(cov_operator, total_variance=total_variance)
+        return self
+
+    def fit(self, X):
+        """
+        Fit PCA without projecting the data
+
+        Args:
+            X: Input data matrix of shape (n_samples, n_features); any array-like
+                supporting row slicing, including np.memmap, or a scipy.sparse
+                matrix (centered implicitly, see _fit_sparse())
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: If n_components exceeds min(n_samples, n_features)
 
         Steps:
-            1. Calculate mean-centered data matrix
-            2. Compute covariance matrix
+            1. Calculate the mean (centering is implicit or block by block)
+            2. Compute the covariance matrix, or the Gram matrix if n < d
             3. Calculate eigenvalues and eigenvectors
             4. Select top n principal components
-            5. Project data onto principal components
         """
-        print(f"\n{'='*60}")
-        print("MANUAL PCA IMPLEMENTATION")
-        print(f"{'='*60}")
+        n_samples, n_features = X.shape
+        if self.n_components > min(n_samples, n_features):
+            raise ValueError(
+                f"n_components={self.n_components} must be at most "
+                f"min(n_samples, n_features)={min(n_samples, n_features)}"
+            )
+        if sparse.issparse(X):
+            return self._fit_sparse(X)
 
-        # Step 1: Mean centering
-        print("\nStep 1: Calculating mean-centered data matrix...")
-        self.mean_ = np.mean(X, axis=0)
-        X_centered = X - self.mean_
-        print(f"  Original data shape: {X.shape}")
-        print(f"  Mean vector shape: {self.mean_.shape}")
+        method = self.method
+        if method == 'auto':
+            method = _choose_method(n_samples, n_features)
 
-        # Step 2: Compute covariance matrix
-        print("\nStep 2: Computing covariance matrix...")
-        n_samples = X_centered.shape[0]
-        cov_matrix = (1 / (n_samples - 1)) * np.dot(X_centered.T, X_centered)
-        print(f"  Covariance matrix shape: {cov_matrix.shape}")
+        self._log(f"\n{'='*60}")
+        self._log("MANUAL PCA IMPLEMENTATION")
+        self._log(f"{'='*60}")
 
-        # Step 3: Calculate eigenvalues and eigenvectors
-        print("\nStep 3: Calculating eigenvalues and eigenvectors...")
-        eigenvalues, eigenvectors = np.linalg.eig(cov_matrix)
+        if method == 'covariance':
+            # Steps 1-2 in one pass: the mean falls out of the accumulated sums
+            self._log("\nStep 1: Calculating mean-centered data matrix...")
+            self._log(f"  Original data shape: {X.shape}")
+            self._log("  Centering is applied implicitly while accumulating X^T X")
 
-        # Sort eigenvalues and eigenvectors in descending order
-        idx = eigenvalues.argsort()[::-1]
-        eigenvalues = eigenvalues[idx]
-        eigenvectors = eigenvectors[:, idx]
+            n_workers = resolve_n_jobs(self.n_jobs)
+            if n_workers > 1:
+                self._log(f"\nStep 2: Computing covariance matrix ({n_workers} processes)...")
+                accumulator = self._accumulate_scatter_distributed(X, n_workers)
+            else:
+                self._log(f"\nStep 2: Computing covariance matrix ({resolve_n_jobs(self.n_threads)} threads)...")
+                accumulator = self._accumulate_scatter(X)
+            self.mean_ = accumulator.mean
+            self._log(f"  Mean vector shape: {self.mean_.shape}")
+            self._log(f"  Covariance matrix shape: {(n_features, n_features)}")
 
-        self.eigenvalues_ = eigenvalues
-        print(f"  Number of eigenvalues: {len(eigenvalues)}")
-        print(f"  Top 5 eigenvalues: {eigenvalues[:5].real}")
+            # Steps 3-4: Eigendecomposition and component selection
+            self._solve(accumulator.covariance())
+        else:
+            # Step 1: Mean centering
+            self._log("\nStep 1: Calculating mean-centered data matrix...")
+            self.mean_ = np.mean(X, axis=0, dtype=np.float64)
+            self._log(f"  Original data shape: {X.shape}")
+            self._log(f"  Mean vector shape: {self.mean_.shape}")
 
-        # Step 4: Select top n principal components
-        print(f"\nStep 4: Selecting top {self.n_components} principal components...")
-        self.components_ = eigenvectors[:, :self.n_components]
-        print(f"  Components shape: {self.components_.shape}")
-
-        # Calculate explained variance ratio
-        total_variance = np.sum(eigenvalues.real)
-        explained_variance = eigenvalues[:self.n_components].real
-        self.explained_variance_ratio_ = explained_variance / total_variance
-        print(f"\n  Explained variance ratio:")
-        for i, ratio in enumerate(self.explained_variance_ratio_):
-            print(f"    PC{i+1}: {ratio*100:.2f}%")
-        print(f"    Total: {np.sum(self.explained_variance_ratio_)*100:.2f}%")
+            # Step 2: n < d, so diagonalize the smaller n x n Gram matrix
+            self._log("\nStep 2: Computing Gram matrix (n_samples < n_features)...")
+            gram = self._gram_matrix(X)
+            gram /= n_samples - 1
+            self._log(f"  Gram matrix shape: {gram.shape}")
+
+            # Steps 3-4: Eigendecomposition and component selection
+            self._solve(gram, X=X)
+        return self
+
+    def fit_transform(self, X):
+        """
+        Fit PCA and transform data
+
+        Args:
+            X: Input data matrix of shape (n_samples, n_features); any array-like
+                supporting row slicing, including np.memmap
+
+        Returns:
+            Transformed data of shape (n_samples, n_components)
+
+        Steps:
+            1-4. Fit the components (see fit())
+            5. Project data onto principal components
+        """
+        self.fit(X)
 
         # Step 5: Project data onto principal components
-        print(f"\nStep 5: Projecting data to {self.n_components}D space...")
-        X_pca = np.dot(X_centered, self.components_).real
-        print(f"  Transformed data shape: {X_pca.shape}")
+        self._log(f"\nStep 5: Projecting data to {self.n_components}D space...")
+        X_pca = self._project(X)
+        self._log(f"  Transformed data shape: {X_pca.shape}")
 
         return X_pca
+
+    def partial_fit(self, X):
+        """
+        Accumulate statistics from one chunk of rows
+
+        Only the row count, column sums and the X^T X scatter matrix are
+        kept, so chunks can come from a generator or a memmap larger than
+        memory. Rows are accumulated relative to the first chunk's mean,
+        which keeps the covariance as accurate as the batch fit.
+
+        Args:
+            X: Chunk of shape (n_rows, n_features)
+
+        Returns:
+            self
+        """
+        if self._accumulator is None:
+            self._accumulator = _ScatterAccumulator(np.mean(X, axis=0, dtype=np.float64))
+        for _, block in self._iter_blocks(X):
+            self._accumulator.update(block)
+        self._n_chunks += 1
+
+        # Components are stale until finalize() runs again
+        self.components_ = None
+        return self
+
+    def finalize(self):
+        """
+        Solve for the components from the statistics of all chunks so far
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: If partial_fit() was never called
+        """
+        if self._accumulator is None:
+            raise ValueError("No data accumulated; call partial_fit() first")
+
+        self._log(f"\n{'='*60}")
+        self._log("MANUAL PCA IMPLEMENTATION (STREAMING)")
+        self._log(f"{'='*60}")
+        self._log(f"\n  Accumulated {self.n_samples_seen_} samples from {self._n_chunks} chunks")
+
+        self.mean_ = self._accumulator.mean
+        self._solve(self._accumulator.covariance())
+        return self
+
+    def transform(self, X):
+        """
+        Project data onto the fitted components in blocks of batch_size rows
+
+        Args:
+            X: Data of shape (n_samples, n_features), e.g. an np.memmap; a
+                single document of shape (n_features,) is treated as one row
+
+        Returns:
+            Transformed data of shape (n_samples, n_components)
+
+        Raises:
+            ValueError: If the model has not been fitted or X does not have
+                n_features columns
+        """
+        if self.components_ is None:
+            if self._accumulator is None:
+                raise ValueError("ManualPCA is not fitted; call fit() or partial_fit() first")
+            self.finalize()
+        return self._project(_as_rows(X, self.components_.shape[0], 'features'))
+
+    def inverse_transform(self, X_pca):
+        """
+        Map projected data back to the original feature space
+
+        Args:
+            X_pca: Data of shape (n_samples, n_components); a single row of
+                shape (n_components,) is treated as one sample
+
+        Returns:
+            Reconstruction of shape (n_samples, n_features)
+
+        Raises:
+            ValueError: If the model has not been fitted or X_pca does not have
+                n_components columns
+        """
+        if self.components_ is None:
+            raise ValueError("ManualPCA is not fitted; call fit() or partial_fit() first")
+        X_pca = _as_rows(X_pca, self.components_.shape[1], 'components')
+        return np.dot(X_pca, self.components_.T) + self.mean_
+
+    def save(self, path):
+        """
+        Save the fitted model to a compressed .npz file
+
+        Only the mean, components and eigenvalue statistics are stored
+        (a few KB for 300 dimensions), not the training data.
+
+        Args:
+            path: Output file path (.npz)
+
+        Raises:
+            ValueError: If the model has not been fitted
+        """
+        if self.components_ is None:
+            raise ValueError("ManualPCA is not fitted; call fit() or partial_fit() first")
+        np.savez_compressed(
+            path,
+            components=self.components_,
+            mean=self.mean_,
+            eigenvalues=self.eigenvalues_,
+            total_variance=np.array(self.total_variance_),
+            explained_variance_ratio=self.explained_variance_ratio_,
+            solver=np.array(self.solver),
+        )
+
+    @classmethod
+    def load(cls, path, batch_size=8192, verbose=True):
+        """
+        Load a model written by save()
+
+        Args:
+            path: Path of the .npz file
+            batch_size: Rows processed at a time by transform() (default: 8192)
+            verbose: Print progress messages (default: True)
+
+        Returns:
+            ManualPCA: Fitted model ready for transform()
+        """
+        with np.load(path) as data:
+            pca = cls(
+                n_components=data['components'].shape[1],
+                batch_size=batch_size,
+                solver=str(data['solver']),
+                verbose=verbose,
+            )
+            pca.components_ = data['components']
+            pca.mean_ = data['mean']
+            pca.eigenvalues_ = data['eigenvalues']
+            pca.explained_variance_ratio_ = data['explained_variance_ratio']
+            pca.total_variance_ = float(data['total_variance'])
+        return pca
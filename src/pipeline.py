@@ -4,14 +4,18 @@ Coordinates the full dimensionality reduction workflow
 """
 
 import time
-from sklearn.manifold import TSNE
+from functools import partial
 
 from .data_loader import load_dataset
 from .embeddings import texts_to_embeddings
 from .pca import ManualPCA
-from .analysis import analyze_pca_components
-from .visualization import visualize_3d, plot_runtime_comparison, plot_category_histogram, plot_variance_pie_charts
-from .reporting import print_runtime_comparison, print_analysis_discussion
+from .tsne import LandmarkTSNE, PhasedTSNE, perplexity_sweep
+from .cache import DEFAULT_MAX_CACHE_BYTES
+from .analysis import analyze_pca_components, analyze_corpus
+from .parallel import open_shared_array, resolve_n_jobs, run_stages, share_array
+from .visualization import (visualize_3d, plot_runtime_comparison, plot_category_histogram,
+                            plot_pca_variance_pie, plot_tsne_variance_pie)
+from .reporting import print_runtime_comparison, print_sweep_report, print_stage_timings, print_analysis_discussion
 
 
 def run_pca_analysis(embeddings, w2v_model, n_components=3):
@@ -19,7 +23,7 @@ def run_pca_analysis(embeddings, w2v_model, n_components=3):
     Run manual PCA analysis on embeddings
 
     Args:
-        embeddings: numpy array of shape (n_samples, n_features)
+        embeddings: numpy array or np.memmap of shape (n_samples, n_features)
         w2v_model: trained Word2Vec model
         n_components: number of principal components (default: 3)
 
@@ -40,43 +44,184 @@ def run_pca_analysis(embeddings, w2v_model, n_components=3):
     return data_pca, runtime, pca
 
 
-def run_tsne_analysis(embeddings, n_components=3, perplexity=30, n_iter=1000):
+def run_tsne_analysis(embeddings, n_components=3, perplexity=30, n_iter=1000,
+                      method='barnes_hut', angle=0.5, pca_components=50, graph=None,
+                      tol=None, max_time=None, n_landmarks=None, refine_iter=0, cache_dir=None,
+                      max_cache_bytes=DEFAULT_MAX_CACHE_BYTES, n_jobs=-1):
     """
     Run t-SNE analysis on embeddings
 
     Args:
-        embeddings: numpy array of shape (n_samples, n_features)
+        embeddings: numpy array or np.memmap of shape (n_samples, n_features)
         n_components: number of dimensions for output (default: 3)
         perplexity: t-SNE perplexity parameter (default: 30)
         n_iter: number of iterations (default: 1000)
+        method: 'barnes_hut' or 'exact' gradient computation (default: 'barnes_hut')
+        angle: Barnes-Hut accuracy/speed trade-off (default: 0.5)
+        pca_components: dimensions kept by the ManualPCA pre-reduction;
+            None feeds the raw embeddings to t-SNE (default: 50)
+        graph: precomputed kNN graph of the PCA-reduced embeddings (see
+            PhasedTSNE.reduce); None computes neighbors inside t-SNE (default: None)
+        tol: stop once KL divergence improves by less than this fraction per
+            50 iterations; None runs all n_iter iterations (default: None)
+        max_time: wall-clock budget in seconds for t-SNE (default: None)
+        n_landmarks: run t-SNE on this many random documents and place the
+            rest by kNN interpolation (LandmarkTSNE); None embeds all
+            documents directly (default: None)
+        refine_iter: gradient steps per placed document in landmark mode
+            (default: 0)
+        cache_dir: directory caching the kNN graph of the reduced embeddings
+            (3 * perplexity + 1 neighbors); None disables caching (default: None)
+        max_cache_bytes: size limit of cache_dir (default: 2 GB)
+        n_jobs: threads for the neighbor search and Barnes-Hut gradient
+            (default: -1, all cores)
 
     Returns:
-        tuple: (data_tsne, runtime_tsne)
+        tuple: (data_tsne, runtime_tsne, tsne_model); tsne_model.timings_
+            holds the time spent in each phase, tsne_model.n_iter_ and
+            stop_reason_ the iterations used and why optimization stopped
     """
-    print(f"\n{'='*60}")
-    print("t-SNE IMPLEMENTATION")
-    print(f"{'='*60}")
-    print(f"\nApplying t-SNE (n_components={n_components})...")
-
     start_time = time.time()
 
-    tsne = TSNE(
+    params = dict(
         n_components=n_components,
-        random_state=42,
         perplexity=perplexity,
         n_iter=n_iter,
-        verbose=1
+        method=method,
+        angle=angle,
+        pca_components=pca_components,
+        tol=tol,
+        max_time=max_time,
+        cache_dir=cache_dir,
+        max_cache_bytes=max_cache_bytes,
+        random_state=42,
+        n_jobs=n_jobs
     )
-    data_tsne = tsne.fit_transform(embeddings)
+    if n_landmarks is not None and n_landmarks < embeddings.shape[0]:
+        tsne = LandmarkTSNE(n_landmarks=n_landmarks, refine_iter=refine_iter, **params)
+        data_tsne = tsne.fit_transform(embeddings)
+    else:
+        tsne = PhasedTSNE(**params)
+        data_tsne = tsne.fit_transform(embeddings, graph=graph)
 
     runtime = time.time() - start_time
 
     print(f"  Transformed data shape: {data_tsne.shape}")
 
-    return data_tsne, runtime
+    return data_tsne, runtime, tsne
+
+
+def run_tsne_sweep(embeddings, perplexities=(5, 15, 30, 50), seeds=(42,), n_components=3,
+                   n_iter=1000, output_dir='outputs/tsne_sweep', graph=None, n_jobs=-1):
+    """
+    Run t-SNE for several perplexities (and seeds) sharing one neighbor search
+
+    Args:
+        embeddings: numpy array or np.memmap of shape (n_samples, n_features)
+        perplexities: perplexity values to compare (default: (5, 15, 30, 50))
+        seeds: random states per perplexity (default: (42,))
+        n_components: number of dimensions for output (default: 3)
+        n_iter: number of iterations per setting (default: 1000)
+        output_dir: directory for the .npy coordinates and sweep_report.csv;
+            None keeps them in memory (default: 'outputs/tsne_sweep')
+        graph: precomputed kNN graph of the PCA-reduced embeddings with at
+            least 3 * max(perplexities) + 1 neighbors per row (default: None)
+        n_jobs: worker processes, -1 for all cores (default: -1)
+
+    Returns:
+        tuple: (results, runtime_sweep); one result dict per setting
+    """
+    start_time = time.time()
+
+    results, shared_timings = perplexity_sweep(
+        embeddings, perplexities, seeds=seeds, graph=graph, output_dir=output_dir,
+        n_jobs=n_jobs, n_components=n_components, n_iter=n_iter
+    )
+
+    runtime = time.time() - start_time
+    print_sweep_report(results, shared_timings, runtime)
+
+    return results, runtime
+
+
+def _stage_embeddings(source):
+    """Embeddings for a stage: the array itself, or opened from a share_array() source"""
+    if isinstance(source, tuple):
+        return open_shared_array(source)
+    return source, None
+
+
+def _tsne_stage(source, cache_dir, max_cache_bytes, tol, max_time, n_landmarks, refine_iter, n_jobs=-1):
+    """
+    Pipeline stage: t-SNE with a cached kNN graph
+
+    Only the coordinates and a few numbers go back to the parent; the model
+    (graph, affinities, PCA) stays in the worker.
+
+    Returns:
+        tuple: (data_tsne, runtime_tsne, timings, convergence)
+    """
+    embeddings, block = _stage_embeddings(source)
+    try:
+        # The graph is built (or loaded) on the PCA-reduced embeddings inside
+        # t-SNE; landmark t-SNE searches neighbors among its landmarks only
+        data_tsne, runtime_tsne, tsne_model = run_tsne_analysis(
+            embeddings, n_components=3, perplexity=30, n_iter=1000, tol=tol, max_time=max_time,
+            n_landmarks=n_landmarks, refine_iter=refine_iter, cache_dir=cache_dir,
+            max_cache_bytes=max_cache_bytes, n_jobs=n_jobs
+        )
+    finally:
+        del embeddings
+        if block is not None:
+            block.close()
+    convergence = {
+        'n_iter': tsne_model.n_iter_,
+        'kl_divergence': tsne_model.kl_divergence_,
+        'stop_reason': tsne_model.stop_reason_,
+    }
+    return data_tsne, runtime_tsne, tsne_model.timings_, convergence
+
+
+def _pca_stage(source):
+    """Pipeline stage: manual PCA; returns run_pca_analysis()"""
+    embeddings, block = _stage_embeddings(source)
+    try:
+        # analyze_pca_components() only reads the PCA model, so the word
+        # vectors are not shipped to the worker
+        return run_pca_analysis(embeddings, None, n_components=3)
+    finally:
+        del embeddings
+        if block is not None:
+            block.close()
+
 
+def _pca_pie_stage(pca_result):
+    """Pipeline stage: PCA variance pie chart"""
+    plot_pca_variance_pie(pca_result[2])
 
-def run_full_pipeline():
+
+def _tsne_pie_stage(tsne_result):
+    """Pipeline stage: t-SNE variance pie chart"""
+    plot_tsne_variance_pie(tsne_result[0])
+
+
+def _scatter_stage(labels, texts, pca_result, tsne_result):
+    """Pipeline stage: 3D PCA vs t-SNE scatter plots"""
+    print(f"\n{'='*60}")
+    print("VISUALIZATION")
+    print(f"{'='*60}")
+    visualize_3d(pca_result[0], tsne_result[0], pca_result[1], tsne_result[1],
+                 labels=labels, texts=texts)
+
+
+def _runtime_chart_stage(pca_result, tsne_result):
+    """Pipeline stage: runtime comparison bar chart"""
+    plot_runtime_comparison(pca_result[1], tsne_result[1])
+
+
+def run_full_pipeline(cache_dir='.cache', pretrained_vectors=None, embeddings_path=None,
+                      tsne_tol=None, tsne_max_time=None, tsne_landmarks=None, tsne_refine_iter=0,
+                      n_jobs=-1, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES):
     """
     Execute the complete dimensionality reduction pipeline
 
@@ -84,11 +229,34 @@ def run_full_pipeline():
     1. Load text dataset with category labels
     2. Generate Word2Vec embeddings (300D)
     3. Apply manual PCA (reduce to 3D)
-    4. Apply t-SNE (reduce to 3D)
+    4. Apply t-SNE (PCA pre-reduction to 50D, then reduce to 3D)
     5. Compare runtime performance
     6. Generate visualizations with category coloring
     7. Print analysis and discussion
 
+    Steps 3-6 run as a stage graph: PCA, its chart and the category
+    histogram run while t-SNE is still optimizing, and only the comparison
+    charts wait for both.
+
+    Args:
+        cache_dir: Directory for cached intermediate results; None disables caching
+            (default: '.cache')
+        pretrained_vectors: Path to pretrained word vectors used instead of
+            training Word2Vec (default: None)
+        embeddings_path: .npy file for out-of-core float32 document embeddings;
+            None keeps them in memory (default: None)
+        tsne_tol: early-stopping tolerance on the t-SNE KL divergence
+            (see run_tsne_analysis) (default: None)
+        tsne_max_time: wall-clock budget in seconds for t-SNE (default: None)
+        tsne_landmarks: number of landmark documents for landmark t-SNE;
+            None runs t-SNE on every document (default: None)
+        tsne_refine_iter: gradient steps per placed document with
+            tsne_landmarks; 0 keeps the weighted-mean placement (default: 0)
+        n_jobs: worker processes for independent stages (PCA, t-SNE, charts);
+            1 runs them one after another (default: -1, all cores)
+        max_cache_bytes: Size limit of cache_dir shared by every cached
+            artifact (default: 2 GB)
+
     Returns:
         dict: Results containing all data and metrics
     """
@@ -98,46 +266,61 @@ def run_full_pipeline():
     # Step 2: Convert texts to embeddings
     print(f"\n2. Converting texts to embeddings...")
     embeddings, tokenized_texts, valid_indices, w2v_model = texts_to_embeddings(
-        texts, vector_size=300
+        texts, vector_size=300, cache_dir=cache_dir, pretrained_vectors=pretrained_vectors,
+        embeddings_path=embeddings_path, max_cache_bytes=max_cache_bytes
     )
+    analyze_corpus(tokenized_texts, top_n=10)
 
     # Filter labels to match valid embeddings
     import numpy as np
     labels_array = np.array(labels)
     valid_labels = labels_array[valid_indices].tolist()
 
-    # Step 3: Apply Manual PCA
-    data_pca, runtime_pca, pca_model = run_pca_analysis(
-        embeddings, w2v_model, n_components=3
-    )
-
-    # Step 4: Apply t-SNE
-    data_tsne, runtime_tsne = run_tsne_analysis(
-        embeddings, n_components=3, perplexity=30, n_iter=1000
-    )
-
-    # Step 5: Runtime comparison
-    print_runtime_comparison(runtime_pca, runtime_tsne)
-
-    # Create runtime comparison bar chart
-    plot_runtime_comparison(runtime_pca, runtime_tsne)
-
-    # Step 6: Visualization with category labels
-    print(f"\n{'='*60}")
-    print("VISUALIZATION")
-    print(f"{'='*60}")
-
     # Get sample texts for annotation
     valid_texts = np.array(texts)[valid_indices].tolist()
 
-    visualize_3d(data_pca, data_tsne, runtime_pca, runtime_tsne,
-                labels=valid_labels, texts=valid_texts)
+    # Steps 3-6 as a stage graph: PCA and its charts, the category histogram
+    # and t-SNE are independent; only the comparison charts wait for both.
+    # The embeddings are bound to the PCA and t-SNE stages below.
+    stages = {
+        'tsne': (partial(_tsne_stage, cache_dir=cache_dir, max_cache_bytes=max_cache_bytes, tol=tsne_tol,
+                         max_time=tsne_max_time, n_landmarks=tsne_landmarks,
+                         refine_iter=tsne_refine_iter), ()),
+        'pca': (_pca_stage, ()),
+        'pca_pie': (_pca_pie_stage, ('pca',)),
+        'category_histogram': (partial(plot_category_histogram, valid_labels), ()),
+        'tsne_pie': (_tsne_pie_stage, ('tsne',)),
+        'scatter_3d': (partial(_scatter_stage, valid_labels, valid_texts), ('pca', 'tsne')),
+        'runtime_chart': (_runtime_chart_stage, ('pca', 'tsne')),
+    }
 
-    # Create category distribution histogram
-    plot_category_histogram(valid_labels)
+    # With a process pool, workers re-open the embeddings memmap (or attach
+    # to one shared memory copy) instead of each receiving a pickled copy,
+    # and t-SNE gets its share of the cores instead of all of them
+    n_workers = min(resolve_n_jobs(n_jobs), len(stages))
+    source, block, tsne_jobs = embeddings, None, -1
+    if n_workers > 1:
+        source, block = share_array(embeddings)
+        tsne_jobs = max(1, resolve_n_jobs(-1) // n_workers)
+    stages['tsne'] = (partial(stages['tsne'][0], source, n_jobs=tsne_jobs), ())
+    stages['pca'] = (partial(_pca_stage, source), ())
 
-    # Create variance pie charts for both methods
-    plot_variance_pie_charts(pca_model, data_pca, data_tsne)
+    start_time = time.time()
+    try:
+        stage_results, stage_seconds = run_stages(stages, n_jobs=n_workers)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+    wall_time = time.time() - start_time
+
+    data_pca, runtime_pca, pca_model = stage_results['pca']
+    data_tsne, runtime_tsne, tsne_timings, tsne_convergence = stage_results['tsne']
+
+    # Runtime comparison
+    print_runtime_comparison(runtime_pca, runtime_tsne, tsne_timings=tsne_timings,
+                             tsne_convergence=tsne_convergence)
+    print_stage_timings(stage_seconds, wall_time)
 
     # Step 7: Analysis and Discussion
     print_analysis_discussion()
@@ -152,6 +335,9 @@ def run_full_pipeline():
         'tsne_data': data_tsne,
         'runtime_pca': runtime_pca,
         'runtime_tsne': runtime_tsne,
+        'tsne_timings': tsne_timings,
+        'tsne_convergence': tsne_convergence,
+        'stage_seconds': stage_seconds,
         'pca_model': pca_model,
         'w2v_model': w2v_model
     }
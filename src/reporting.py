@@ -89,13 +89,26 @@ def print_footer():
     print(f"{'='*60}\n")
 
 
-def print_runtime_comparison(runtime_pca, runtime_tsne):
+# Display names of the t-SNE phases recorded in PhasedTSNE.timings_
+TSNE_PHASE_LABELS = {
+    'pca': 'PCA pre-reduction',
+    'neighbors': 'Neighbors',
+    'affinities': 'Affinities',
+    'optimization': 'Optimization',
+    'placement': 'Landmark placement',
+}
+
+
+def print_runtime_comparison(runtime_pca, runtime_tsne, tsne_timings=None, tsne_convergence=None):
     """
     Print runtime comparison between PCA and t-SNE
 
     Args:
         runtime_pca: PCA execution time in seconds
         runtime_tsne: t-SNE execution time in seconds
+        tsne_timings: Optional dict of seconds per t-SNE phase (default: None)
+        tsne_convergence: Optional dict with the t-SNE n_iter, kl_divergence
+            and stop_reason (default: None)
     """
     print(f"\n{'='*60}")
     print("RUNTIME COMPARISON")
@@ -105,6 +118,60 @@ def print_runtime_comparison(runtime_pca, runtime_tsne):
     print(f"  Speedup (t-SNE/PCA): {runtime_tsne/runtime_pca:.2f}x")
     print(f"  PCA is {runtime_tsne/runtime_pca:.2f}x faster than t-SNE")
 
+    if tsne_timings:
+        print("\n  t-SNE phase breakdown:")
+        for phase, seconds in tsne_timings.items():
+            label = TSNE_PHASE_LABELS.get(phase, phase)
+            share = seconds / runtime_tsne * 100 if runtime_tsne else 0.0
+            print(f"    {label + ':':<20} {seconds:.4f}s ({share:5.1f}%)")
+
+    if tsne_convergence:
+        print("\n  t-SNE convergence:")
+        print(f"    Iterations used:     {tsne_convergence['n_iter']} (stopped by {tsne_convergence['stop_reason']})")
+        print(f"    Final KL divergence: {tsne_convergence['kl_divergence']:.4f}")
+
+
+def print_sweep_report(results, shared_timings, wall_seconds):
+    """
+    Print timing and KL divergence for every setting of a t-SNE perplexity sweep
+
+    Args:
+        results: Per-setting dicts from src.tsne.perplexity_sweep()
+        shared_timings: Seconds spent in the shared PCA and neighbor phases
+        wall_seconds: Elapsed wall time of the whole sweep
+    """
+    print(f"\n{'='*60}")
+    print("PERPLEXITY SWEEP REPORT")
+    print(f"{'='*60}")
+    for phase, seconds in shared_timings.items():
+        label = TSNE_PHASE_LABELS.get(phase, phase)
+        print(f"  Shared {label + ':':<20} {seconds:.4f}s")
+
+    print(f"\n  {'Perplexity':>10}  {'Seed':>6}  {'KL':>8}  {'Iter':>5}  {'Time (s)':>9}")
+    for result in results:
+        print(f"  {result['perplexity']:>10g}  {result['seed']:>6}  {result['kl_divergence']:>8.4f}"
+              f"  {result['n_iter']:>5}  {result['seconds']:>9.2f}")
+
+    best = min(results, key=lambda result: result['kl_divergence'])
+    serial_seconds = sum(shared_timings.values()) + sum(result['seconds'] for result in results)
+    print(f"\n  Lowest KL: perplexity={best['perplexity']:g}, seed={best['seed']} ({best['kl_divergence']:.4f})")
+    print(f"  Sweep wall time:     {wall_seconds:.2f}s (sequential estimate {serial_seconds:.2f}s)")
+
+
+def print_stage_timings(stage_seconds, wall_seconds):
+    """
+    Print the wall time of every pipeline stage against the total
+
+    Args:
+        stage_seconds: dict of stage name -> seconds (see src.parallel.run_stages)
+        wall_seconds: Elapsed wall time of all stages together
+    """
+    print("\n  Pipeline stages:")
+    for stage, seconds in sorted(stage_seconds.items(), key=lambda item: -item[1]):
+        print(f"    {stage + ':':<20} {seconds:.4f}s")
+    total = sum(stage_seconds.values())
+    print(f"    {'Wall time:':<20} {wall_seconds:.4f}s (stages sum to {total:.4f}s)")
+
 
 def print_analysis_discussion():
     """
@@ -0,0 +1,982 @@
+"""
+t-SNE with separately timed neighbor, affinity and optimization phases
+"""
+
+import csv
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.neighbors import NearestNeighbors
+
+from .cache import DEFAULT_MAX_CACHE_BYTES
+from .knn import KNN_METHODS, cached_knn_graph, truncate_knn_graph
+from .parallel import parallel_map, resolve_n_jobs
+from .pca import ManualPCA
+
+
+MACHINE_EPSILON = np.finfo(np.double).eps
+
+# Gradient methods selectable via PhasedTSNE(method=...)
+TSNE_METHODS = ('barnes_hut', 'exact')
+
+
+def _conditional_probabilities(sq_distances, perplexity, tol=1e-5, max_iter=100):
+    """
+    Gaussian conditional probabilities p_j|i matching a target perplexity
+
+    The precision beta_i of every row is found by bisection on the row
+    entropy, for all rows at once.
+
+    Args:
+        sq_distances: Squared neighbor distances of shape (n_rows, k)
+        perplexity: Target perplexity (effective number of neighbors)
+        tol: Tolerance on the entropy in nats (default: 1e-5)
+        max_iter: Maximum bisection steps (default: 100)
+
+    Returns:
+        Conditional probabilities of shape (n_rows, k); each row sums to 1
+    """
+    # Shifting each row by its minimum leaves p_j|i unchanged and avoids underflow
+    D = sq_distances - sq_distances.min(axis=1, keepdims=True)
+    n_rows = D.shape[0]
+    target = np.log(perplexity)
+    beta = np.ones(n_rows)
+    beta_min = np.zeros(n_rows)
+    beta_max = np.full(n_rows, np.inf)
+
+    for _ in range(max_iter):
+        P = np.exp(-D * beta[:, None])
+        sum_P = P.sum(axis=1)
+        entropy = np.log(sum_P) + beta * np.einsum('ij,ij->i', D, P) / sum_P
+        diff = entropy - target
+        if np.all(np.abs(diff) <= tol):
+            break
+
+        # Entropy too high -> distribution too flat -> increase beta
+        too_flat = diff > 0
+        beta_min = np.where(too_flat, beta, beta_min)
+        beta_max = np.where(too_flat, beta_max, beta)
+        beta = np.where(
+            too_flat,
+            np.where(np.isinf(beta_max), beta * 2, (beta + beta_max) / 2),
+            (beta + beta_min) / 2,
+        )
+
+    return P / sum_P[:, None]
+
+
+def compute_affinities(graph, perplexity, block_entries=2**22):
+    """
+    Symmetric joint probabilities P from a k-nearest-neighbor distance graph
+
+    Args:
+        graph: CSR distance graph with the same number of entries per row
+            (see src.knn.knn_graph)
+        perplexity: Target perplexity
+        block_entries: Distances processed at a time (default: 4M)
+
+    Returns:
+        scipy.sparse.csr_matrix: P = (P_cond + P_cond^T) / sum, summing to 1
+    """
+    n_samples = graph.shape[0]
+    n_neighbors = graph.indptr[1] - graph.indptr[0] if n_samples else 0
+    if np.any(np.diff(graph.indptr) != n_neighbors):
+        raise ValueError("Neighbor graph must have the same number of neighbors in every row")
+
+    sq_distances = graph.data.reshape(n_samples, n_neighbors)
+    conditional = np.empty_like(sq_distances, dtype=np.float64)
+    rows_per_block = max(1, block_entries // max(n_neighbors, 1))
+    for start in range(0, n_samples, rows_per_block):
+        stop = start + rows_per_block
+        conditional[start:stop] = _conditional_probabilities(sq_distances[start:stop], perplexity)
+
+    P = sparse.csr_matrix((conditional.ravel(), graph.indices, graph.indptr), shape=graph.shape)
+    P = (P + P.T).tocsr()
+    P /= max(P.sum(), MACHINE_EPSILON)
+    return P
+
+
+def compute_dense_affinities(X, perplexity, block_size=1024):
+    """
+    Dense symmetric joint probabilities P over all pairs of points
+
+    Used by the exact gradient, which needs every p_ij anyway: the squared
+    distances are computed in blocks of rows and never stored, so the
+    only n x n array is P itself.
+
+    Args:
+        X: Data of shape (n_samples, n_features)
+        perplexity: Target perplexity
+        block_size: Rows per distance block (default: 1024)
+
+    Returns:
+        numpy.ndarray: P of shape (n_samples, n_samples) with zero diagonal,
+            summing to 1
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_samples = X.shape[0]
+    sq_norms = np.einsum('ij,ij->i', X, X)
+    P = np.zeros((n_samples, n_samples))
+    off_diagonal = ~np.eye(min(block_size, n_samples), n_samples, dtype=bool)
+    for start in range(0, n_samples, block_size):
+        stop = min(start + block_size, n_samples)
+        d2 = sq_norms[start:stop, None] + sq_norms[None, :] - 2.0 * (X[start:stop] @ X.T)
+        np.maximum(d2, 0.0, out=d2)
+        # Drop each row's own point before calibrating its bandwidth
+        mask = np.roll(off_diagonal[:stop - start], start, axis=1)
+        conditional = _conditional_probabilities(d2[mask].reshape(stop - start, n_samples - 1), perplexity)
+        P[start:stop][mask] = conditional.ravel()
+
+    P += P.T
+    P /= max(P.sum(), MACHINE_EPSILON)
+    return P
+
+
+def _exact_kl_gradient(Y, P, degrees_of_freedom, compute_error=True, block_size=1024):
+    """
+    KL divergence and its gradient with exact O(n^2) repulsive forces
+
+    q_ij = w_ij / Z with w_ij = (1 + |y_i - y_j|^2 / dof)^(-(dof + 1) / 2).
+    Forces are (p_ij - q_ij) w_ij (y_i - y_j), the expression used by
+    scikit-learn's t-SNE kernels, so 'exact' and 'barnes_hut' agree as the
+    angle goes to 0 (for dof = 1 this is the exact KL gradient). Attractive
+    forces come from the stored entries of a sparse P, or are accumulated
+    block by block with the repulsion for a dense P; repulsive forces and
+    Z are accumulated over blocks of rows, so no other n x n matrix is kept.
+
+    Args:
+        Y: Embedding of shape (n_samples, n_components)
+        P: Symmetric joint probabilities summing to 1, as CSR or as a dense
+            array (see compute_dense_affinities)
+        degrees_of_freedom: Degrees of freedom of the Student-t kernel
+        compute_error: Also compute the KL divergence (default: True)
+        block_size: Rows per repulsion block (default: 1024)
+
+    Returns:
+        tuple: (kl_divergence or NaN, gradient of shape Y.shape)
+    """
+    n_samples = Y.shape[0]
+    exponent = (degrees_of_freedom + 1.0) / 2.0
+    dense = not sparse.issparse(P)
+    kl_divergence = 0.0
+
+    if dense:
+        attractive = np.empty_like(Y)
+    else:
+        # Attractive term over the non-zeros of P
+        rows = np.repeat(np.arange(n_samples), np.diff(P.indptr))
+        diff = Y[rows] - Y[P.indices]
+        log_u = -np.log1p(np.einsum('ij,ij->i', diff, diff) / degrees_of_freedom)
+        weights = P.data * np.exp(exponent * log_u)
+        attractive = np.column_stack([
+            np.bincount(rows, weights=weights * diff[:, dim], minlength=n_samples)
+            for dim in range(Y.shape[1])
+        ])
+        if compute_error:
+            p = np.maximum(P.data, MACHINE_EPSILON)
+            kl_divergence = float(np.dot(P.data, np.log(p) - exponent * log_u))
+
+    # Repulsive term and normalization Z over all pairs
+    sq_norms = np.einsum('ij,ij->i', Y, Y)
+    repulsive = np.empty_like(Y)
+    Z = 0.0
+    for start in range(0, n_samples, block_size):
+        Y_block = Y[start:start + block_size]
+        d2 = sq_norms[start:start + block_size, None] + sq_norms[None, :] - 2.0 * (Y_block @ Y.T)
+        np.maximum(d2, 0.0, out=d2)
+        u_block = 1.0 / (1.0 + d2 / degrees_of_freedom)
+        w_block = u_block if exponent == 1.0 else u_block ** exponent
+        diagonal = np.arange(Y_block.shape[0])
+        w_block[diagonal, start + diagonal] = 0.0
+        Z += w_block.sum()
+        ww = w_block * w_block
+        repulsive[start:start + block_size] = ww.sum(axis=1)[:, None] * Y_block - ww @ Y
+        if dense:
+            P_block = P[start:start + block_size]
+            pw = P_block * w_block
+            attractive[start:start + block_size] = pw.sum(axis=1)[:, None] * Y_block - pw @ Y
+            if compute_error:
+                # The diagonal has p = 0 (and w = 0), so it contributes nothing
+                kl_divergence += float(np.sum(P_block * (
+                    np.log(np.maximum(P_block, MACHINE_EPSILON))
+                    - np.log(np.maximum(w_block, np.finfo(np.double).tiny)))))
+
+    Z = max(Z, MACHINE_EPSILON)
+    c = 2.0 * (degrees_of_freedom + 1.0) / degrees_of_freedom
+    grad = c * (attractive - repulsive / Z)
+
+    if compute_error:
+        total = P.sum() if dense else P.data.sum()
+        kl_divergence += float(total * np.log(Z))
+    else:
+        kl_divergence = np.nan
+
+    return kl_divergence, grad
+
+
+def _barnes_hut_kernel():
+    """
+    scikit-learn's compiled Barnes-Hut t-SNE kernel
+
+    The kernel is private to scikit-learn, so requirements.txt pins the
+    versions it has been checked against.
+
+    Returns:
+        Callable sklearn.manifold._t_sne._kl_divergence_bh
+
+    Raises:
+        ImportError: If the installed scikit-learn does not provide it
+    """
+    try:
+        from sklearn.manifold._t_sne import _kl_divergence_bh
+    except ImportError as exc:
+        raise ImportError(
+            "method='barnes_hut' needs the Barnes-Hut kernel of scikit-learn "
+            "(sklearn.manifold._t_sne._kl_divergence_bh), which this scikit-learn "
+            "version does not provide; install a version allowed by requirements.txt "
+            "or use method='exact'"
+        ) from exc
+    return _kl_divergence_bh
+
+
+def _barnes_hut_kl_gradient(Y, P, degrees_of_freedom, compute_error=True, angle=0.5, n_threads=1):
+    """
+    KL divergence and its gradient with Barnes-Hut approximated repulsion
+
+    Uses the compiled octree kernel shipped with scikit-learn, which
+    supports at most 3 embedding dimensions.
+
+    Args:
+        Y: Embedding of shape (n_samples, n_components)
+        P: Symmetric CSR joint probabilities summing to 1
+        degrees_of_freedom: Degrees of freedom of the Student-t kernel
+        compute_error: Also compute the KL divergence (default: True)
+        angle: Barnes-Hut opening angle theta (default: 0.5)
+        n_threads: OpenMP threads for the gradient (default: 1)
+
+    Returns:
+        tuple: (kl_divergence or NaN, gradient of shape Y.shape)
+    """
+    n_samples, n_components = Y.shape
+    kl_divergence, grad = _barnes_hut_kernel()(
+        Y.astype(np.float32).ravel(), P, degrees_of_freedom, n_samples, n_components,
+        angle=angle, compute_error=compute_error, num_threads=n_threads,
+    )
+    return (kl_divergence if compute_error else np.nan), grad.reshape(n_samples, n_components).astype(np.float64)
+
+
+class PhasedTSNE:
+    """
+    t-SNE split into separately timed phases
+
+    1. PCA pre-reduction (ManualPCA) to about 50 dimensions
+    2. k-nearest-neighbor search (k = 3 * perplexity), exact or with the
+       approximate index in src.knn; skipped by method='exact'
+    3. Affinities: per-point Gaussian bandwidths matching the perplexity
+       (dense over all pairs for method='exact')
+    4. Optimization: gradient descent with momentum, per-parameter gains and
+       early exaggeration (the same schedule as scikit-learn), using exact or
+       Barnes-Hut gradients
+
+    The time spent in each phase is recorded in timings_. A precomputed
+    neighbor graph or affinity matrix can be passed to fit_transform() to
+    skip phases 2-3; the ones used are kept in graph_ and affinities_, and
+    the fitted pre-reduction in pca_.
+    """
+
+    # Iterations with early exaggeration and lower momentum
+    EXPLORATION_ITER = 250
+
+    # Iterations between KL divergence evaluations
+    CHECK_EVERY = 50
+
+    def __init__(self, n_components=3, perplexity=30, n_iter=1000, method='barnes_hut', angle=0.5,
+                 pca_components=50, neighbors='auto', recall_target=0.9, early_exaggeration=12.0,
+                 learning_rate='auto', init='pca', min_grad_norm=1e-7, tol=None, max_time=None,
+                 cache_dir=None, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES, random_state=42, n_jobs=-1,
+                 verbose=True):
+        """
+        Initialize t-SNE
+
+        Args:
+            n_components: Output dimensions (default: 3)
+            perplexity: Effective number of neighbors (default: 30)
+            n_iter: Number of gradient descent iterations (default: 1000)
+            method: 'barnes_hut' (O(n log n), n_components <= 3) or 'exact'
+                (O(n^2), all pairs) (default: 'barnes_hut')
+            angle: Barnes-Hut opening angle; smaller is slower and more
+                accurate (default: 0.5)
+            pca_components: Dimensions kept by the PCA pre-reduction; None
+                disables it (default: 50)
+            neighbors: Neighbor search - 'exact', 'approx' (random-projection
+                forest, see src.knn) or 'auto' (default: 'auto')
+            recall_target: Required recall of the approximate search (default: 0.9)
+            early_exaggeration: Factor applied to P during exploration (default: 12.0)
+            learning_rate: Step size, or 'auto' for max(n / early_exaggeration / 4, 50)
+                (default: 'auto')
+            init: 'pca', 'random' or an array of shape (n_samples, n_components)
+                used as the initial embedding (default: 'pca')
+            min_grad_norm: Stop once the gradient norm falls below this (default: 1e-7)
+            tol: Stop once KL divergence improves by less than this fraction
+                over CHECK_EVERY iterations after exploration; None always runs
+                n_iter iterations (default: None)
+            max_time: Wall-clock budget in seconds for fit_transform(); the
+                optimization stops before an iteration would exceed it
+                (default: None)
+            cache_dir: Directory caching the neighbor graph of the reduced
+                data (see src.knn.cached_knn_graph); None disables caching
+                (default: None)
+            max_cache_bytes: Size limit of cache_dir (default: 2 GB)
+            random_state: Seed for initialization (default: 42)
+            n_jobs: Threads for the neighbor search and Barnes-Hut gradient;
+                -1 uses all cores (default: -1)
+            verbose: Print progress for every phase (default: True)
+        """
+        if method not in TSNE_METHODS:
+            raise ValueError(f"Unknown method '{method}'; choose from 'barnes_hut', 'exact'")
+        if method == 'barnes_hut' and n_components > 3:
+            raise ValueError("method='barnes_hut' supports at most 3 components; use method='exact'")
+        if neighbors not in KNN_METHODS:
+            raise ValueError(f"Unknown neighbors '{neighbors}'; choose from 'auto', 'exact', 'approx'")
+        if isinstance(init, str) and init not in ('pca', 'random'):
+            raise ValueError(f"Unknown init '{init}'; choose from 'pca', 'random'")
+        if method == 'barnes_hut':
+            # Fail before the expensive phases if the kernel is unavailable
+            _barnes_hut_kernel()
+
+        self.n_components = n_components
+        self.perplexity = perplexity
+        self.n_iter = n_iter
+        self.method = method
+        self.angle = angle
+        self.pca_components = pca_components
+        self.neighbors = neighbors
+        self.recall_target = recall_target
+        self.early_exaggeration = early_exaggeration
+        self.learning_rate = learning_rate
+        self.init = init
+        self.min_grad_norm = min_grad_norm
+        self.tol = tol
+        self.max_time = max_time
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.embedding_ = None
+        self.kl_divergence_ = None
+        self.n_iter_ = None
+        self.stop_reason_ = None
+        self.graph_ = None
+        self.affinities_ = None
+        self.pca_ = None
+        self.timings_ = {}
+
+    def _log(self, message):
+        """Print a progress message unless verbose is off"""
+        if self.verbose:
+            print(message)
+
+    def _reduce(self, X):
+        """
+        Phase 1: PCA pre-reduction
+
+        Args:
+            X: Data of shape (n_samples, n_features)
+
+        Returns:
+            tuple: (reduced data, PCA coordinates usable as initialization or None)
+        """
+        n_samples, n_features = X.shape
+        self.pca_ = None
+        if self.pca_components is None or self.pca_components >= n_features:
+            self._log("\nPhase 1: PCA pre-reduction skipped")
+            return np.asarray(X, dtype=np.float64), None
+
+        n_keep = min(self.pca_components, n_samples)
+        self._log(f"\nPhase 1: PCA pre-reduction {n_features}D -> {n_keep}D...")
+        pca = ManualPCA(n_components=n_keep, random_state=self.random_state, verbose=False)
+        X_reduced = pca.fit_transform(X)
+        self.pca_ = pca
+        self._log(f"  Variance retained: {np.sum(pca.explained_variance_ratio_)*100:.2f}%")
+        return X_reduced, X_reduced
+
+    def reduce(self, X):
+        """
+        Fit the PCA pre-reduction and return the data t-SNE works on
+
+        A graph passed to fit_transform() must hold neighbors in this space.
+
+        Args:
+            X: Data of shape (n_samples, n_features)
+
+        Returns:
+            Reduced data of shape (n_samples, pca_components)
+        """
+        return self._reduce(X)[0]
+
+    def _initial_embedding(self, X, X_pca, n_samples):
+        """
+        Initial embedding: top PCA coordinates (or Gaussian noise) scaled to std 1e-4,
+        or the array passed as init
+
+        Args:
+            X: Data after pre-reduction
+            X_pca: PCA coordinates from pre-reduction, or None
+            n_samples: Number of points
+
+        Returns:
+            Array of shape (n_samples, n_components)
+
+        Raises:
+            ValueError: If an init array has the wrong shape
+        """
+        if not isinstance(self.init, str):
+            Y = np.array(self.init, dtype=np.float64)
+            if Y.shape != (n_samples, self.n_components):
+                raise ValueError(f"init array has shape {Y.shape}; expected "
+                                 f"({n_samples}, {self.n_components})")
+            return Y
+        if self.init == 'random':
+            rng = np.random.default_rng(self.random_state)
+            return 1e-4 * rng.standard_normal((n_samples, self.n_components))
+
+        if X_pca is None or X_pca.shape[1] < self.n_components:
+            pca = ManualPCA(n_components=self.n_components, random_state=self.random_state, verbose=False)
+            X_pca = pca.fit_transform(X)
+        Y = np.array(X_pca[:, :self.n_components], dtype=np.float64)
+        return Y / np.std(Y[:, 0]) * 1e-4
+
+    def _objective(self, n_threads):
+        """Gradient function for the configured method"""
+        if self.method == 'exact':
+            return _exact_kl_gradient
+
+        def barnes_hut(Y, P, degrees_of_freedom, compute_error=True):
+            return _barnes_hut_kl_gradient(Y, P, degrees_of_freedom, compute_error, self.angle, n_threads)
+        return barnes_hut
+
+    def optimize(self, P, Y, deadline=None):
+        """
+        Phase 4: minimize KL(P || Q) by gradient descent
+
+        Stops after n_iter iterations, or earlier when the gradient norm
+        falls below min_grad_norm, the KL divergence improves by less than
+        tol, or the next iteration would run past the deadline. The reason
+        is kept in stop_reason_.
+
+        Args:
+            P: Symmetric CSR joint probabilities summing to 1
+            Y: Initial embedding of shape (n_samples, n_components)
+            deadline: time.perf_counter() value to finish by (default: None)
+
+        Returns:
+            Optimized embedding of shape (n_samples, n_components)
+        """
+        n_samples = Y.shape[0]
+        degrees_of_freedom = max(self.n_components - 1, 1)
+        objective = self._objective(resolve_n_jobs(self.n_jobs))
+        if self.learning_rate == 'auto':
+            learning_rate = max(n_samples / self.early_exaggeration / 4, 50)
+        else:
+            learning_rate = self.learning_rate
+
+        P_exaggerated = P * self.early_exaggeration
+        Y = np.array(Y, dtype=np.float64)
+        update = np.zeros_like(Y)
+        gains = np.ones_like(Y)
+        kl_divergence = np.nan
+        previous_kl = None
+        stop_reason = 'n_iter'
+        start = time.perf_counter()
+
+        n_done = 0
+        for it in range(self.n_iter):
+            if deadline is not None and it > 0:
+                now = time.perf_counter()
+                if now + (now - start) / it > deadline:
+                    stop_reason = 'max_time'
+                    break
+
+            exploring = it < self.EXPLORATION_ITER
+            momentum = 0.5 if exploring else 0.8
+            check = (it + 1) % self.CHECK_EVERY == 0 or it == self.n_iter - 1
+
+            kl_divergence, grad = objective(
+                Y, P_exaggerated if exploring else P, degrees_of_freedom, compute_error=check
+            )
+
+            increase = update * grad < 0.0
+            gains[increase] += 0.2
+            gains[~increase] *= 0.8
+            np.clip(gains, 0.01, np.inf, out=gains)
+            grad *= gains
+            update = momentum * update - learning_rate * grad
+            Y += update
+            n_done = it + 1
+
+            if check:
+                grad_norm = np.linalg.norm(grad)
+                stage = " (exaggerated)" if exploring else ""
+                self._log(f"  Iteration {it + 1}: KL divergence = {kl_divergence:.4f}{stage}, "
+                          f"gradient norm = {grad_norm:.2e}")
+                if grad_norm <= self.min_grad_norm:
+                    self._log(f"  Gradient norm below {self.min_grad_norm}; stopping")
+                    stop_reason = 'min_grad_norm'
+                    break
+                if not exploring and self.tol is not None:
+                    if previous_kl is not None and previous_kl - kl_divergence < self.tol * previous_kl:
+                        self._log(f"  KL divergence improved by less than {self.tol:g}; stopping")
+                        stop_reason = 'tol'
+                        break
+                    previous_kl = kl_divergence
+
+        if stop_reason == 'max_time':
+            self._log(f"  Time budget of {self.max_time:g}s reached; stopping")
+        if n_done <= self.EXPLORATION_ITER or (stop_reason == 'max_time' and n_done % self.CHECK_EVERY):
+            # The last KL is missing, stale, or measured against the exaggerated P
+            kl_divergence, _ = objective(Y, P, degrees_of_freedom, compute_error=True)
+
+        self.n_iter_ = n_done
+        self.kl_divergence_ = kl_divergence
+        self.stop_reason_ = stop_reason
+        return Y
+
+    def _neighbor_graph(self, X, graph):
+        """
+        Phase 2: k-nearest-neighbor graph, computed or taken from graph
+
+        Args:
+            X: Data after pre-reduction
+            graph: Precomputed CSR distance graph, or None
+
+        Returns:
+            scipy.sparse.csr_matrix: Graph of squared distances
+        """
+        n_samples = X.shape[0]
+        if self.method == 'exact':
+            n_neighbors = n_samples - 1
+        else:
+            n_neighbors = min(n_samples - 1, int(3 * self.perplexity + 1))
+
+        if graph is not None:
+            if graph.shape != (n_samples, n_samples):
+                raise ValueError(f"Graph of shape {graph.shape} does not match {n_samples} samples")
+            stored = graph.indptr[1] - graph.indptr[0]
+            self._log(f"\nPhase 2: Using precomputed neighbor graph ({stored} neighbors per point)")
+            if stored > n_neighbors:
+                graph = truncate_knn_graph(graph, n_neighbors)
+            return graph
+
+        self._log(f"\nPhase 2: Computing {n_neighbors} nearest neighbors...")
+        graph = cached_knn_graph(
+            X, n_neighbors, cache_dir=self.cache_dir, method=self.neighbors,
+            recall_target=self.recall_target, random_state=self.random_state,
+            max_cache_bytes=self.max_cache_bytes, n_jobs=self.n_jobs, verbose=self.verbose,
+        )
+        self._log(f"  Neighbor graph: {graph.nnz} edges")
+        return graph
+
+    def fit_transform(self, X, graph=None, affinities=None):
+        """
+        Embed X, timing each phase
+
+        Args:
+            X: Data of shape (n_samples, n_features), e.g. np.memmap embeddings
+            graph: Precomputed kNN graph of the pre-reduced data reduce(X)
+                (CSR, squared distances, e.g. from src.knn.cached_knn_graph);
+                skips the neighbor search (default: None)
+            affinities: Precomputed joint probabilities P (CSR, or dense for
+                method='exact'; e.g. affinities_ of an earlier run); skips
+                phases 2-3 (default: None)
+
+        Returns:
+            Embedding of shape (n_samples, n_components)
+        """
+        n_samples = X.shape[0]
+        self._log(f"\n{'='*60}")
+        self._log(f"t-SNE IMPLEMENTATION ({self.method})")
+        self._log(f"{'='*60}")
+        self.timings_ = {}
+        deadline = None if self.max_time is None else time.perf_counter() + self.max_time
+
+        start = time.perf_counter()
+        X_reduced, X_pca = self._reduce(X)
+        self.timings_['pca'] = time.perf_counter() - start
+
+        if affinities is not None:
+            self._log("\nPhases 2-3: Using precomputed affinities")
+            self.timings_['neighbors'] = 0.0
+            self.timings_['affinities'] = 0.0
+            if self.method == 'exact' and isinstance(affinities, np.ndarray):
+                P = affinities
+            else:
+                P = sparse.csr_matrix(affinities)
+        elif self.method == 'exact' and graph is None:
+            # Every pair enters the exact gradient, so P is built densely
+            # from blocked distances rather than from an (n - 1)-NN graph
+            self._log("\nPhase 2: Neighbor search skipped (exact method uses all pairs)")
+            self.timings_['neighbors'] = 0.0
+            self._log(f"\nPhase 3: Computing dense affinities (perplexity={self.perplexity})...")
+            start = time.perf_counter()
+            P = compute_dense_affinities(X_reduced, self.perplexity)
+            self.timings_['affinities'] = time.perf_counter() - start
+            self._log(f"  Joint probability matrix: {P.shape[0]} x {P.shape[1]} dense")
+        else:
+            start = time.perf_counter()
+            self.graph_ = self._neighbor_graph(X_reduced, graph)
+            self.timings_['neighbors'] = time.perf_counter() - start
+
+            # Phase 3: Affinities
+            self._log(f"\nPhase 3: Computing affinities (perplexity={self.perplexity})...")
+            start = time.perf_counter()
+            P = compute_affinities(self.graph_, self.perplexity)
+            self.timings_['affinities'] = time.perf_counter() - start
+            self._log(f"  Joint probability matrix: {P.nnz} non-zeros")
+        self.affinities_ = P
+
+        # Phase 4: Optimization
+        self._log(f"\nPhase 4: Optimizing embedding (up to {self.n_iter} iterations)...")
+        start = time.perf_counter()
+        Y = self._initial_embedding(X_reduced, X_pca, n_samples)
+        self.embedding_ = self.optimize(P, Y, deadline=deadline)
+        self.timings_['optimization'] = time.perf_counter() - start
+        self._log(f"  Final KL divergence: {self.kl_divergence_:.4f} after {self.n_iter_} iterations "
+                  f"(stopped by {self.stop_reason_})")
+
+        return self.embedding_
+
+
+# Data shared by every perplexity_sweep() setting, set once per worker
+_SWEEP_SHARED = {}
+
+
+def _init_sweep_worker(X_reduced, graph, init):
+    """Store the shared sweep data in this worker (parallel_map initializer)"""
+    _SWEEP_SHARED.update(X_reduced=X_reduced, graph=graph, init=init)
+
+
+def _sweep_run(task):
+    """
+    Run one perplexity/seed setting of perplexity_sweep() (picklable worker)
+
+    The reduced data, shared graph and initial embedding come from
+    _init_sweep_worker(), so tasks stay small.
+
+    Args:
+        task: (tsne_params, perplexity, seed, n_threads)
+
+    Returns:
+        dict: perplexity, seed, embedding, kl_divergence, n_iter, seconds
+    """
+    tsne_params, perplexity, seed, n_threads = task
+    start = time.perf_counter()
+    tsne = PhasedTSNE(perplexity=perplexity, random_state=seed, pca_components=None,
+                      n_jobs=n_threads, verbose=False, **dict(tsne_params, init=_SWEEP_SHARED['init']))
+    embedding = tsne.fit_transform(_SWEEP_SHARED['X_reduced'], graph=_SWEEP_SHARED['graph'])
+    return {
+        'perplexity': perplexity,
+        'seed': seed,
+        'embedding': embedding,
+        'kl_divergence': tsne.kl_divergence_,
+        'n_iter': tsne.n_iter_,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def perplexity_sweep(X, perplexities, seeds=(42,), pca_components=50, graph=None, output_dir=None,
+                     n_jobs=-1, verbose=True, **tsne_params):
+    """
+    Run t-SNE for every perplexity/seed combination on one shared neighbor graph
+
+    The PCA pre-reduction, the neighbor search (k = 3 * max(perplexities) + 1)
+    and the PCA initial embedding run once and are shipped once to each
+    worker process; each setting truncates the shared graph, computes its own
+    affinities and optimizes. With method='exact' no graph is built and each
+    setting computes its dense affinities from the reduced data.
+
+    Args:
+        X: Data of shape (n_samples, n_features), e.g. np.memmap embeddings
+        perplexities: Perplexity values to try
+        seeds: Random states to try for every perplexity; they only change the
+            result with init='random' (default: (42,))
+        pca_components: Dimensions kept by the shared PCA pre-reduction (default: 50)
+        graph: Precomputed kNN graph of the pre-reduced data (see
+            PhasedTSNE.reduce) with at least 3 * max(perplexities) + 1
+            neighbors per row (default: None)
+        output_dir: Directory for one tsne_perplexity<p>_seed<s>.npy per setting
+            and sweep_report.csv; None keeps results in memory only (default: None)
+        n_jobs: Worker processes; threads are split evenly between them
+            (-1 uses all cores, default: -1)
+        verbose: Print progress (default: True)
+        **tsne_params: Further PhasedTSNE arguments shared by all settings
+            (n_components, n_iter, method, ...)
+
+    Returns:
+        tuple: (results, shared_timings) - one dict per setting (perplexity,
+            seed, embedding, kl_divergence, n_iter, seconds, path) in input
+            order, and the seconds spent in the shared pca/neighbors phases
+    """
+    for reserved in ('perplexity', 'random_state', 'n_jobs', 'verbose'):
+        if reserved in tsne_params:
+            raise ValueError(f"'{reserved}' is set per sweep setting and cannot be passed to perplexity_sweep()")
+    perplexities = list(perplexities)
+    seeds = list(seeds)
+    if not perplexities or not seeds:
+        raise ValueError("perplexity_sweep() needs at least one perplexity and one seed")
+
+    settings = [(perplexity, seed) for perplexity in perplexities for seed in seeds]
+    n_threads = resolve_n_jobs(n_jobs)
+    n_workers = min(n_threads, len(settings))
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"t-SNE PERPLEXITY SWEEP ({len(settings)} settings, {n_workers} workers)")
+        print(f"{'='*60}")
+
+    shared = PhasedTSNE(perplexity=max(perplexities), random_state=seeds[0], pca_components=pca_components,
+                        n_jobs=n_jobs, verbose=verbose, **tsne_params)
+    shared_timings = {}
+    start = time.perf_counter()
+    X_reduced, X_pca = shared._reduce(X)
+    shared_timings['pca'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if shared.method != 'exact' or graph is not None:
+        graph = shared._neighbor_graph(X_reduced, graph)
+    shared_timings['neighbors'] = time.perf_counter() - start
+
+    # A PCA init does not depend on the seed, so it is computed once here
+    init = shared.init
+    if isinstance(init, str) and init == 'pca':
+        init = shared._initial_embedding(X_reduced, X_pca, X_reduced.shape[0])
+
+    if verbose:
+        print(f"\nRunning {len(settings)} optimizations...")
+    tasks = [(tsne_params, perplexity, seed, max(1, n_threads // n_workers))
+             for perplexity, seed in settings]
+    try:
+        results = parallel_map(_sweep_run, tasks, n_jobs=n_workers, initializer=_init_sweep_worker,
+                               initargs=(X_reduced, graph, init))
+    finally:
+        _SWEEP_SHARED.clear()
+
+    for result in results:
+        result['path'] = None
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            result['path'] = os.path.join(
+                output_dir, f"tsne_perplexity{result['perplexity']:g}_seed{result['seed']}.npy")
+            np.save(result['path'], result['embedding'])
+
+    if output_dir is not None:
+        report_path = os.path.join(output_dir, 'sweep_report.csv')
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['perplexity', 'seed', 'kl_divergence', 'n_iter', 'seconds', 'path'])
+            for result in results:
+                writer.writerow([result['perplexity'], result['seed'], f"{result['kl_divergence']:.6f}",
+                                 result['n_iter'], f"{result['seconds']:.3f}", result['path']])
+        if verbose:
+            print(f"  Saved {len(results)} embeddings and {report_path}")
+
+    return results, shared_timings
+
+
+class LandmarkTSNE:
+    """
+    t-SNE on a random subsample of landmarks, with out-of-sample placement
+
+    1. Fit PhasedTSNE on n_landmarks randomly chosen points
+    2. Place every other (or new) point at the weighted mean of its
+       n_neighbors nearest landmarks in the PCA-reduced space, with
+       Gaussian weights calibrated to perplexity n_neighbors / 3 (the ratio
+       t-SNE itself uses between neighbors and perplexity)
+    3. Optionally refine each placement by refine_iter gradient steps on
+       its own KL divergence against the fixed landmark embedding
+
+    Placement is linear in the number of points, so the cost of a large
+    dataset is dominated by the landmark fit.
+    """
+
+    def __init__(self, n_landmarks=5000, n_neighbors=10, refine_iter=0, refine_learning_rate=1.0,
+                 batch_size=8192, random_state=42, verbose=True, **tsne_params):
+        """
+        Initialize landmark t-SNE
+
+        Args:
+            n_landmarks: Points embedded by t-SNE proper (default: 5000)
+            n_neighbors: Landmarks used to place each point (default: 10)
+            refine_iter: Gradient steps per placed point; 0 keeps the
+                interpolated position (default: 0)
+            refine_learning_rate: Step size of the refinement (default: 1.0)
+            batch_size: Points placed at a time (default: 8192)
+            random_state: Seed for landmark selection and t-SNE (default: 42)
+            verbose: Print progress (default: True)
+            **tsne_params: Further PhasedTSNE arguments for the landmark fit
+        """
+        if n_neighbors < 2:
+            raise ValueError("n_neighbors must be at least 2")
+        self.n_landmarks = n_landmarks
+        self.n_neighbors = n_neighbors
+        self.refine_iter = refine_iter
+        self.refine_learning_rate = refine_learning_rate
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.verbose = verbose
+        self.tsne_ = PhasedTSNE(random_state=random_state, verbose=verbose, **tsne_params)
+        self.landmark_indices_ = None
+        self.landmark_embedding_ = None
+        self.embedding_ = None
+        self.timings_ = {}
+        self._index = None
+
+    def _log(self, message):
+        """Print a progress message unless verbose is off"""
+        if self.verbose:
+            print(message)
+
+    @property
+    def kl_divergence_(self):
+        """KL divergence of the landmark embedding"""
+        return self.tsne_.kl_divergence_
+
+    @property
+    def n_iter_(self):
+        """Iterations used by the landmark fit"""
+        return self.tsne_.n_iter_
+
+    @property
+    def stop_reason_(self):
+        """Why the landmark optimization stopped"""
+        return self.tsne_.stop_reason_
+
+    def _reduce(self, X):
+        """Map points into the space the landmark neighbors were searched in"""
+        if self.tsne_.pca_ is None:
+            return np.asarray(X, dtype=np.float64)
+        return self.tsne_.pca_.transform(X)
+
+    def fit(self, X):
+        """
+        Select landmarks and embed them with t-SNE
+
+        Args:
+            X: Data of shape (n_samples, n_features), e.g. np.memmap embeddings
+
+        Returns:
+            self
+        """
+        n_samples = X.shape[0]
+        n_landmarks = min(self.n_landmarks, n_samples)
+        if n_landmarks <= self.n_neighbors:
+            raise ValueError(f"Need more than n_neighbors={self.n_neighbors} landmarks, got {n_landmarks}")
+
+        self._log(f"\nLandmark t-SNE: {n_landmarks} of {n_samples} points")
+        rng = np.random.default_rng(self.random_state)
+        self.landmark_indices_ = np.sort(rng.choice(n_samples, size=n_landmarks, replace=False))
+        X_landmarks = np.asarray(X[self.landmark_indices_])
+        self.landmark_embedding_ = self.tsne_.fit_transform(X_landmarks)
+        self.timings_ = dict(self.tsne_.timings_)
+
+        self._index = NearestNeighbors(n_neighbors=self.n_neighbors, n_jobs=self.tsne_.n_jobs)
+        self._index.fit(self._reduce(X_landmarks))
+        return self
+
+    def _refine(self, Y, weights):
+        """
+        Gradient steps on KL(p_i || q_i) for every placed point i
+
+        q_i is the Student-t distribution of point i over all landmarks,
+        which stay fixed; p_i holds the interpolation weights on its
+        nearest landmarks.
+
+        Args:
+            Y: Initial placements of shape (n_points, n_components)
+            weights: Dense (n_points, n_landmarks) attraction weights p_i
+
+        Returns:
+            Refined placements
+        """
+        landmarks = self.landmark_embedding_
+        degrees_of_freedom = max(landmarks.shape[1] - 1, 1)
+        exponent = (degrees_of_freedom + 1.0) / 2.0
+        landmark_sq_norms = np.einsum('ij,ij->i', landmarks, landmarks)
+        update = np.zeros_like(Y)
+        for _ in range(self.refine_iter):
+            sq_dist = np.einsum('ij,ij->i', Y, Y)[:, None] - 2.0 * (Y @ landmarks.T) + landmark_sq_norms
+            np.maximum(sq_dist, 0.0, out=sq_dist)
+            inverse = 1.0 / (1.0 + sq_dist / degrees_of_freedom)
+            Q = inverse ** exponent
+            Q /= Q.sum(axis=1, keepdims=True)
+            PQd = (weights - Q) * inverse
+            grad = (2.0 * exponent / degrees_of_freedom) * (
+                PQd.sum(axis=1, keepdims=True) * Y - PQd @ landmarks)
+            update = 0.5 * update - self.refine_learning_rate * grad
+            Y = Y + update
+        return Y
+
+    def transform(self, X):
+        """
+        Place points in the landmark embedding
+
+        Args:
+            X: Data of shape (n_samples, n_features), processed in blocks of
+                batch_size rows (e.g. an np.memmap or new documents)
+
+        Returns:
+            Embedding of shape (n_samples, n_components)
+
+        Raises:
+            ValueError: If the model has not been fitted
+        """
+        if self._index is None:
+            raise ValueError("LandmarkTSNE is not fitted; call fit() first")
+
+        n_samples = X.shape[0]
+        n_landmarks = self.landmark_embedding_.shape[0]
+        perplexity = self.n_neighbors / 3.0
+        # Bound the dense (batch, n_landmarks) refinement matrices to about 2**24 entries
+        batch_size = self.batch_size if not self.refine_iter else max(1, min(self.batch_size, 2**24 // n_landmarks))
+        Y = np.empty((n_samples, self.landmark_embedding_.shape[1]))
+        for start in range(0, n_samples, batch_size):
+            stop = min(start + batch_size, n_samples)
+            distances, indices = self._index.kneighbors(self._reduce(X[start:stop]))
+            P = _conditional_probabilities(distances ** 2, perplexity)
+            block = np.einsum('ij,ijk->ik', P, self.landmark_embedding_[indices])
+            if self.refine_iter:
+                weights = np.zeros((stop - start, n_landmarks))
+                np.put_along_axis(weights, indices, P, axis=1)
+                block = self._refine(block, weights)
+            Y[start:stop] = block
+        return Y
+
+    def fit_transform(self, X):
+        """
+        Embed X: t-SNE on the landmarks, placement for all other points
+
+        Args:
+            X: Data of shape (n_samples, n_features), e.g. np.memmap embeddings
+
+        Returns:
+            Embedding of shape (n_samples, n_components)
+        """
+        self.fit(X)
+        n_samples = X.shape[0]
+        others = np.setdiff1d(np.arange(n_samples), self.landmark_indices_, assume_unique=True)
+
+        mode = f", {self.refine_iter} refinement steps" if self.refine_iter else ""
+        self._log(f"\nPlacing {len(others)} points on {len(self.landmark_indices_)} landmarks{mode}...")
+        start = time.perf_counter()
+        Y = np.empty((n_samples, self.landmark_embedding_.shape[1]))
+        Y[self.landmark_indices_] = self.landmark_embedding_
+        for block_start in range(0, len(others), self.batch_size):
+            rows = others[block_start:block_start + self.batch_size]
+            Y[rows] = self.transform(X[rows])
+        self.timings_['placement'] = time.perf_counter() - start
+        self._log(f"  Placement: {self.timings_['placement']:.2f}s")
+
+        self.embedding_ = Y
+        return Y
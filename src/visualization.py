@@ -239,18 +239,14 @@ def plot_category_histogram(labels, output_dir='outputs'):
     plt.close()
 
 
-def plot_variance_pie_charts(pca_model, data_pca, data_tsne, output_dir='outputs'):
+def plot_pca_variance_pie(pca_model, output_dir='outputs'):
     """
-    Create separate pie charts showing explained variance for PCA and t-SNE methods
+    Create a pie chart of the variance explained by each principal component
 
     Args:
         pca_model: Fitted PCA model with explained_variance_ratio_
-        data_pca: PCA-transformed data for calculating component variances
-        data_tsne: t-SNE-transformed data for calculating dimension variances
         output_dir: Directory to save visualization (default: 'outputs')
     """
-    print("\nCreating variance explanation pie charts...")
-
     pca_variance_ratios = pca_model.explained_variance_ratio_
 
     # ===== PCA Pie Chart (Separate Plot) =====
@@ -306,6 +302,25 @@ def plot_variance_pie_charts(pca_model, data_pca, data_tsne, output_dir='outputs
     print(f"PCA variance pie chart saved as '{filepath1}'")
     plt.close()
 
+    # Print detailed statistics
+    print(f"\n   PCA Variance Explanation:")
+    print(f"   {'='*50}")
+    print(f"   PC1: {pca_variance_ratios[0]*100:>6.2f}% of original variance")
+    print(f"   PC2: {pca_variance_ratios[1]*100:>6.2f}% of original variance")
+    print(f"   PC3: {pca_variance_ratios[2]*100:>6.2f}% of original variance")
+    print(f"   {'='*50}")
+    print(f"   Total captured: {pca_variance_ratios.sum()*100:>6.2f}%")
+    print(f"   Total lost:     {(1-pca_variance_ratios.sum())*100:>6.2f}%")
+
+
+def plot_tsne_variance_pie(data_tsne, output_dir='outputs'):
+    """
+    Create a pie chart of the relative variance of each t-SNE output dimension
+
+    Args:
+        data_tsne: t-SNE-transformed data for calculating dimension variances
+        output_dir: Directory to save visualization (default: 'outputs')
+    """
     # ===== t-SNE Pie Chart (Separate Plot) =====
     fig2, ax2 = plt.subplots(figsize=(10, 8))
 
@@ -357,16 +372,6 @@ def plot_variance_pie_charts(pca_model, data_pca, data_tsne, output_dir='outputs
     print(f"t-SNE variance pie chart saved as '{filepath2}'")
     plt.close()
 
-    # Print detailed statistics
-    print(f"\n   PCA Variance Explanation:")
-    print(f"   {'='*50}")
-    print(f"   PC1: {pca_variance_ratios[0]*100:>6.2f}% of original variance")
-    print(f"   PC2: {pca_variance_ratios[1]*100:>6.2f}% of original variance")
-    print(f"   PC3: {pca_variance_ratios[2]*100:>6.2f}% of original variance")
-    print(f"   {'='*50}")
-    print(f"   Total captured: {pca_variance_ratios.sum()*100:>6.2f}%")
-    print(f"   Total lost:     {(1-pca_variance_ratios.sum())*100:>6.2f}%")
-
     print(f"\n   t-SNE Relative Dimension Distribution:")
     print(f"   {'='*50}")
     print(f"   Dimension 1: {tsne_var_ratio[0]*100:>6.2f}% (relative)")
@@ -375,3 +380,18 @@ def plot_variance_pie_charts(pca_model, data_pca, data_tsne, output_dir='outputs
     print(f"   {'='*50}")
     print(f"   Note: t-SNE doesn't preserve variance - values show")
     print(f"         how spread varies across the 3 output dimensions")
+
+
+def plot_variance_pie_charts(pca_model, data_pca, data_tsne, output_dir='outputs'):
+    """
+    Create separate pie charts showing explained variance for PCA and t-SNE methods
+
+    Args:
+        pca_model: Fitted PCA model with explained_variance_ratio_
+        data_pca: PCA-transformed data for calculating component variances
+        data_tsne: t-SNE-transformed data for calculating dimension variances
+        output_dir: Directory to save visualization (default: 'outputs')
+    """
+    print("\nCreating variance explanation pie charts...")
+    plot_pca_variance_pie(pca_model, output_dir=output_dir)
+    plot_tsne_variance_pie(data_tsne, output_dir=output_dir)
@@ -0,0 +1,37 @@
+"""
+Tests for loading tabular files passed to load_dataset
+"""
+
+import pandas as pd
+import pytest
+
+from src.categorizer import categorize_text
+from src.data_loader import load_dataset
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'id': range(4),
+        'text': [
+            "The bible and the gospel were discussed at length here",
+            "Separation of church and state is a democratic principle",
+            "Scientific evidence from research should guide the debate",
+            "Nothing in this line matches any of the keyword lists",
+        ],
+    })
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_load_dataset_reads_text_column(tmp_path, frame, suffix):
+    path = tmp_path / f'export{suffix}'
+    if suffix == '.csv':
+        frame.to_csv(path, index=False)
+    else:
+        pytest.importorskip('pyarrow')
+        frame.to_parquet(path, index=False)
+
+    texts, labels = load_dataset(str(path), max_samples=None)
+
+    assert texts == frame['text'].tolist()
+    assert labels == [categorize_text(text) for text in texts]
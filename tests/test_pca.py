@@ -0,0 +1,37 @@
+"""
+Tests for ManualPCA input shapes
+"""
+
+import numpy as np
+import pytest
+
+from src.pca import ManualPCA
+
+
+@pytest.fixture
+def fitted():
+    X = np.random.default_rng(0).standard_normal((200, 80))
+    return X, ManualPCA(n_components=5, verbose=False).fit(X)
+
+
+def test_transform_single_document(fitted):
+    X, pca = fitted
+    single = pca.transform(X[0])
+    assert single.shape == (1, 5)
+    np.testing.assert_allclose(single, pca.transform(X[:1]))
+
+
+def test_inverse_transform_single_row(fitted):
+    X, pca = fitted
+    coords = pca.transform(X[:1])
+    np.testing.assert_allclose(pca.inverse_transform(coords[0]), pca.inverse_transform(coords))
+
+
+def test_transform_rejects_wrong_shapes(fitted):
+    X, pca = fitted
+    with pytest.raises(ValueError):
+        pca.transform(X[:, :10])
+    with pytest.raises(ValueError):
+        pca.transform(X[None])
+    with pytest.raises(ValueError):
+        pca.inverse_transform(np.zeros((2, 4)))